@@ -14,6 +14,18 @@ from routes.meeting import bp as meeting_bp
 from routes.candidates import candidates_bp
 from routes.jobs import jobs_bp
 from routes.searches import searches_bp
+from routes.skills import skills_bp
+from services import model_events
+from services.materialized_matches import job_matches, saved_search_results
+from services.search_cache import match_score_memo, search_result_cache
+from services.search_metrics import search_metrics
+from services.skill_taxonomy import skill_taxonomy
+from services.gazetteer import gazetteer
+from services.hiring import HiringMatchingService, candidate_scoring_engine
+from services.text_embeddings import candidate_embedding_index
+from services.parallel_scoring import parallel_scoring_executor
+from services.import_jobs import import_job_runner
+from services.import_mapping import import_mapping_executor
 from db import db
 import config
 
@@ -37,6 +49,30 @@ def create_app():
     app.register_blueprint(candidates_bp)
     app.register_blueprint(jobs_bp)
     app.register_blueprint(searches_bp)
+    app.register_blueprint(skills_bp)
+    # In-process search indexes kept current on commit
+    model_events.init_app(app)
+    skill_taxonomy.init_app(app)
+    gazetteer.init_app(app)
+    candidate_scoring_engine.init_app(app)
+    candidate_embedding_index.init_app(app)
+    parallel_scoring_executor.init_app(app)
+    search_result_cache.init_app(app)
+    match_score_memo.init_app(app)
+    search_metrics.init_app(app)
+    saved_search_results.init_app(app)
+    job_matches.init_app(app)
+    import_mapping_executor.init_app(app)
+    import_job_runner.init_app(app)
+    # Normalized skills change when the taxonomy is reloaded
+    skill_taxonomy.on_reload(HiringMatchingService.renormalize_persisted_skills)
+    skill_taxonomy.on_reload(candidate_scoring_engine.rebuild)
+    skill_taxonomy.on_reload(candidate_embedding_index.rebuild)
+    # Workers hold their own taxonomy; restart them on the reloaded file
+    skill_taxonomy.on_reload(parallel_scoring_executor.shutdown)
+    skill_taxonomy.on_reload(import_mapping_executor.shutdown)
+    skill_taxonomy.on_reload(search_result_cache.clear)
+    skill_taxonomy.on_reload(match_score_memo.clear)
     return app
 
 
@@ -0,0 +1,96 @@
+"""add normalized_skills columns
+
+Revision ID: 3f9c2d7a8b41
+Revises: ff56ce2ae99d
+Create Date: 2026-10-18 10:12:31.402518
+
+"""
+from typing import Sequence, Union
+import json
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d7a8b41'
+down_revision: Union[str, None] = 'ff56ce2ae99d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# The skill taxonomy file the application is configured with
+SKILL_TAXONOMY_PATH = os.getenv('SKILL_TAXONOMY_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'skill_taxonomy.json'))
+
+
+def _load_aliases():
+    """Alias -> canonical skill table of the taxonomy file; the first skill claiming an alias wins"""
+    with open(SKILL_TAXONOMY_PATH) as f:
+        data = json.load(f)
+    aliases = {}
+    for name, entry in data.get('skills', {}).items():
+        canonical = name.lower().strip()
+        for alias in [canonical] + list(entry.get('aliases', [])):
+            aliases.setdefault(alias.lower().strip(), canonical)
+    return aliases
+
+
+def _normalize_skills(aliases, skills):
+    """Lowercased, stripped and alias-resolved skills without duplicates, in order"""
+    return list(dict.fromkeys(aliases.get(skill.lower().strip(), skill.lower().strip()) for skill in (skills or [])))
+
+
+def _backfill(table_name: str) -> None:
+    """Populate normalized_skills from skills in id-ordered batches"""
+    connection = op.get_bind()
+    aliases = _load_aliases()
+    table = sa.table(table_name,
+                     sa.column('id', sa.String),
+                     sa.column('skills', postgresql.ARRAY(sa.String)),
+                     sa.column('normalized_skills', postgresql.ARRAY(sa.String)))
+
+    last_id = ''
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.skills)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        updates = [
+            {'row_id': row_id,
+             'normalized': _normalize_skills(aliases, skills)}
+            for row_id, skills in rows
+        ]
+        connection.execute(
+            table.update()
+            .where(table.c.id == sa.bindparam('row_id'))
+            .values(normalized_skills=sa.bindparam('normalized')),
+            updates
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.add_column('candidate_profiles', sa.Column('normalized_skills', postgresql.ARRAY(sa.String(length=128)), server_default='{}', nullable=False))
+    op.add_column('work_experience', sa.Column('normalized_skills', postgresql.ARRAY(sa.String(length=128)), server_default='{}', nullable=False))
+
+    _backfill('candidate_profiles')
+    _backfill('work_experience')
+
+    op.create_index('ix_candidate_profiles_normalized_skills', 'candidate_profiles', ['normalized_skills'], unique=False, postgresql_using='gin')
+    op.create_index('ix_work_experience_normalized_skills', 'work_experience', ['normalized_skills'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_work_experience_normalized_skills', table_name='work_experience', postgresql_using='gin')
+    op.drop_index('ix_candidate_profiles_normalized_skills', table_name='candidate_profiles', postgresql_using='gin')
+    op.drop_column('work_experience', 'normalized_skills')
+    op.drop_column('candidate_profiles', 'normalized_skills')
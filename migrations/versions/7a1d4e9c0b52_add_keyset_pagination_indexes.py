@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: 7a1d4e9c0b52
+Revises: 3f9c2d7a8b41
+Create Date: 2026-10-18 11:05:47.118392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1d4e9c0b52'
+down_revision: Union[str, None] = '3f9c2d7a8b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_candidate_profiles_name_id', 'candidate_profiles', ['name', 'id'], unique=False)
+    op.create_index('ix_candidate_profiles_experience_level_id', 'candidate_profiles', ['experience_level', 'id'], unique=False)
+    op.create_index('ix_candidate_profiles_location_id', 'candidate_profiles', ['location', 'id'], unique=False)
+    op.create_index('ix_candidate_profiles_created_at_id', 'candidate_profiles', ['created_at', 'id'], unique=False)
+    op.create_index('ix_job_postings_founder_id_posted_at_id', 'job_postings', ['founder_id', 'posted_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_postings_founder_id_posted_at_id', table_name='job_postings')
+    op.drop_index('ix_candidate_profiles_created_at_id', table_name='candidate_profiles')
+    op.drop_index('ix_candidate_profiles_location_id', table_name='candidate_profiles')
+    op.drop_index('ix_candidate_profiles_experience_level_id', table_name='candidate_profiles')
+    op.drop_index('ix_candidate_profiles_name_id', table_name='candidate_profiles')
@@ -0,0 +1,44 @@
+"""add full-text search vectors
+
+Revision ID: a91e4c7d3b58
+Revises: f3a8d0c5b219
+Create Date: 2026-10-18 17:24:05.118437
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91e4c7d3b58'
+down_revision: Union[str, None] = 'f3a8d0c5b219'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('candidate_profiles', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(bio, '')), 'B')",
+        persisted=True
+    ), nullable=True))
+    op.add_column('work_experience', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(role_description, '')), 'C')",
+        persisted=True
+    ), nullable=True))
+    op.create_index('ix_candidate_profiles_search_vector', 'candidate_profiles', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_work_experience_search_vector', 'work_experience', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_work_experience_candidate_id', 'work_experience', ['candidate_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_work_experience_candidate_id', table_name='work_experience')
+    op.drop_index('ix_work_experience_search_vector', table_name='work_experience', postgresql_using='gin')
+    op.drop_index('ix_candidate_profiles_search_vector', table_name='candidate_profiles', postgresql_using='gin')
+    op.drop_column('work_experience', 'search_vector')
+    op.drop_column('candidate_profiles', 'search_vector')
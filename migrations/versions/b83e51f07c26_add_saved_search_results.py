@@ -0,0 +1,44 @@
+"""add saved search results
+
+Revision ID: b83e51f07c26
+Revises: 7a1d4e9c0b52
+Create Date: 2026-10-18 13:22:09.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83e51f07c26'
+down_revision: Union[str, None] = '7a1d4e9c0b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('saved_searches', sa.Column('results_refreshed_at', sa.DateTime(), nullable=True))
+    op.create_table('saved_search_results',
+    sa.Column('saved_search_id', sa.String(length=36), nullable=False),
+    sa.Column('candidate_id', sa.String(length=36), nullable=False),
+    sa.Column('match_score', sa.Float(), nullable=False),
+    sa.Column('skills_score', sa.Float(), nullable=False),
+    sa.Column('experience_score', sa.Float(), nullable=False),
+    sa.Column('location_score', sa.Float(), nullable=False),
+    sa.Column('availability_score', sa.Float(), nullable=False),
+    sa.Column('matched_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('saved_search_id', 'candidate_id')
+    )
+    op.create_index('ix_saved_search_results_ranking', 'saved_search_results', ['saved_search_id', 'match_score', 'candidate_id'], unique=False)
+    op.create_index('ix_saved_search_results_candidate_id', 'saved_search_results', ['candidate_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_saved_search_results_candidate_id', table_name='saved_search_results')
+    op.drop_index('ix_saved_search_results_ranking', table_name='saved_search_results')
+    op.drop_table('saved_search_results')
+    op.drop_column('saved_searches', 'results_refreshed_at')
@@ -0,0 +1,44 @@
+"""add job candidate matches
+
+Revision ID: c4a7f2e93d18
+Revises: b83e51f07c26
+Create Date: 2026-10-18 14:40:52.287311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7f2e93d18'
+down_revision: Union[str, None] = 'b83e51f07c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job_postings', sa.Column('matches_refreshed_at', sa.DateTime(), nullable=True))
+    op.create_table('job_candidate_matches',
+    sa.Column('job_id', sa.String(length=36), nullable=False),
+    sa.Column('candidate_id', sa.String(length=36), nullable=False),
+    sa.Column('match_score', sa.Float(), nullable=False),
+    sa.Column('skills_score', sa.Float(), nullable=False),
+    sa.Column('experience_score', sa.Float(), nullable=False),
+    sa.Column('location_score', sa.Float(), nullable=False),
+    sa.Column('availability_score', sa.Float(), nullable=False),
+    sa.Column('matched_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['job_postings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'candidate_id')
+    )
+    op.create_index('ix_job_candidate_matches_ranking', 'job_candidate_matches', ['job_id', 'match_score', 'candidate_id'], unique=False)
+    op.create_index('ix_job_candidate_matches_candidate_id', 'job_candidate_matches', ['candidate_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_candidate_matches_candidate_id', table_name='job_candidate_matches')
+    op.drop_index('ix_job_candidate_matches_ranking', table_name='job_candidate_matches')
+    op.drop_table('job_candidate_matches')
+    op.drop_column('job_postings', 'matches_refreshed_at')
@@ -0,0 +1,31 @@
+"""add candidate import hash
+
+Revision ID: c7d3a1f85e42
+Revises: b5e2c9d47a16
+Create Date: 2026-10-18 21:04:37.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3a1f85e42'
+down_revision: Union[str, None] = 'b5e2c9d47a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Null until a candidate is next imported, so the first delta import updates every existing row once
+    op.add_column('candidate_profiles', sa.Column('import_hash', sa.String(length=64), nullable=True))
+    op.add_column('candidate_import_jobs', sa.Column('mode', sa.String(length=16), nullable=False, server_default='insert'))
+    op.add_column('candidate_import_jobs', sa.Column('updated', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('candidate_import_jobs', 'updated')
+    op.drop_column('candidate_import_jobs', 'mode')
+    op.drop_column('candidate_profiles', 'import_hash')
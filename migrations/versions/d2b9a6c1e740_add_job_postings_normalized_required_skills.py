@@ -0,0 +1,82 @@
+"""add job_postings normalized_required_skills
+
+Revision ID: d2b9a6c1e740
+Revises: c4a7f2e93d18
+Create Date: 2026-10-18 15:31:26.904157
+
+"""
+from typing import Sequence, Union
+import json
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b9a6c1e740'
+down_revision: Union[str, None] = 'c4a7f2e93d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# The skill taxonomy file the application is configured with
+SKILL_TAXONOMY_PATH = os.getenv('SKILL_TAXONOMY_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'skill_taxonomy.json'))
+
+
+def _load_aliases():
+    """Alias -> canonical skill table of the taxonomy file; the first skill claiming an alias wins"""
+    with open(SKILL_TAXONOMY_PATH) as f:
+        data = json.load(f)
+    aliases = {}
+    for name, entry in data.get('skills', {}).items():
+        canonical = name.lower().strip()
+        for alias in [canonical] + list(entry.get('aliases', [])):
+            aliases.setdefault(alias.lower().strip(), canonical)
+    return aliases
+
+
+def _normalize_skills(aliases, skills):
+    """Lowercased, stripped and alias-resolved skills without duplicates, in order"""
+    return list(dict.fromkeys(aliases.get(skill.lower().strip(), skill.lower().strip()) for skill in (skills or [])))
+
+
+def upgrade() -> None:
+    op.add_column('job_postings', sa.Column('normalized_required_skills', postgresql.ARRAY(sa.String(length=128)), server_default='{}', nullable=False))
+
+    # Backfill from required_skills in id-ordered batches
+    connection = op.get_bind()
+    aliases = _load_aliases()
+    table = sa.table('job_postings',
+                     sa.column('id', sa.String),
+                     sa.column('required_skills', postgresql.ARRAY(sa.String)),
+                     sa.column('normalized_required_skills', postgresql.ARRAY(sa.String)))
+    last_id = ''
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.required_skills)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            table.update()
+            .where(table.c.id == sa.bindparam('row_id'))
+            .values(normalized_required_skills=sa.bindparam('normalized')),
+            [{'row_id': row_id,
+              'normalized': _normalize_skills(aliases, skills)}
+             for row_id, skills in rows]
+        )
+        last_id = rows[-1][0]
+
+    op.create_index('ix_job_postings_active_normalized_required_skills', 'job_postings', ['normalized_required_skills'], unique=False, postgresql_using='gin', postgresql_where=sa.text("status = 'active'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_postings_active_normalized_required_skills', table_name='job_postings', postgresql_using='gin', postgresql_where=sa.text("status = 'active'"))
+    op.drop_column('job_postings', 'normalized_required_skills')
@@ -0,0 +1,146 @@
+"""add location coordinates
+
+Revision ID: e6c1f8a24d97
+Revises: d2b9a6c1e740
+Create Date: 2026-10-18 16:02:47.518302
+
+"""
+from typing import Sequence, Union
+import json
+import os
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c1f8a24d97'
+down_revision: Union[str, None] = 'd2b9a6c1e740'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# The gazetteer file the application is configured with
+GAZETTEER_PATH = os.getenv('GAZETTEER_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'gazetteer.json'))
+
+# Geohash length stored per candidate
+GEOHASH_PRECISION = 8
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+_POSTAL_CODE = re.compile(r'\s+\d{5}(-\d{4})?$')
+
+
+def _clean(location):
+    parts = [' '.join(part.split()) for part in location.lower().split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def _load_gazetteer():
+    """(places, regions, countries) of the gazetteer file; the first place claiming a name wins"""
+    with open(GAZETTEER_PATH) as f:
+        data = json.load(f)
+    places = {}
+    for name, entry in data.get('places', {}).items():
+        point = (float(entry['lat']), float(entry['lon']))
+        for alias in [name] + list(entry.get('aliases', [])):
+            places.setdefault(_clean(alias), point)
+    regions = {name.lower(): code.lower() for name, code in data.get('regions', {}).items()}
+    countries = frozenset(country.lower() for country in data.get('countries', []))
+    return places, regions, countries
+
+
+def _resolve(gazetteer, location):
+    """(latitude, longitude) of a raw "city, region" location, ignoring a postal code and US country name"""
+    if not location:
+        return None
+    places, regions, countries = gazetteer
+    parts = _clean(location).split(', ')
+    if len(parts) > 1 and parts[-1] in countries:
+        parts.pop()
+    parts[-1] = _POSTAL_CODE.sub('', parts[-1])
+    if len(parts) > 1:
+        parts[-1] = regions.get(parts[-1], parts[-1])
+    return places.get(', '.join(parts))
+
+
+def _geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard base-32 geohash of a point"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def _backfill(table_name: str, with_geohash: bool):
+    """Geocode existing locations through the gazetteer in id-ordered batches"""
+    connection = op.get_bind()
+    gazetteer = _load_gazetteer()
+    columns = [sa.column('id', sa.String), sa.column('location', sa.String),
+               sa.column('latitude', sa.Float), sa.column('longitude', sa.Float)]
+    if with_geohash:
+        columns.append(sa.column('geohash', sa.String))
+    table = sa.table(table_name, *columns)
+
+    last_id = ''
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.location)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row_id, location in rows:
+            point = _resolve(gazetteer, location)
+            if point is None:
+                continue
+            update = {'row_id': row_id, 'lat': point[0], 'lon': point[1]}
+            if with_geohash:
+                update['hash'] = _geohash_encode(*point)
+            updates.append(update)
+        if updates:
+            values = {'latitude': sa.bindparam('lat'), 'longitude': sa.bindparam('lon')}
+            if with_geohash:
+                values['geohash'] = sa.bindparam('hash')
+            connection.execute(table.update().where(table.c.id == sa.bindparam('row_id')).values(**values), updates)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.add_column('candidate_profiles', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('candidate_profiles', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('candidate_profiles', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.add_column('job_postings', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('job_postings', sa.Column('longitude', sa.Float(), nullable=True))
+
+    _backfill('candidate_profiles', with_geohash=True)
+    _backfill('job_postings', with_geohash=False)
+
+    op.create_index('ix_candidate_profiles_geohash', 'candidate_profiles', ['geohash'], unique=False, postgresql_ops={'geohash': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidate_profiles_geohash', table_name='candidate_profiles', postgresql_ops={'geohash': 'varchar_pattern_ops'})
+    op.drop_column('job_postings', 'longitude')
+    op.drop_column('job_postings', 'latitude')
+    op.drop_column('candidate_profiles', 'geohash')
+    op.drop_column('candidate_profiles', 'longitude')
+    op.drop_column('candidate_profiles', 'latitude')
@@ -0,0 +1,31 @@
+"""add saved_searches prefilter_skills
+
+Revision ID: e8b4f6a2c913
+Revises: c7d3a1f85e42
+Create Date: 2026-10-18 22:16:05.381947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f6a2c913'
+down_revision: Union[str, None] = 'c7d3a1f85e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Null (checked against every candidate write) until the saved search is next written or the skill
+    # taxonomy is reloaded; computing it needs the taxonomy, which is application state
+    op.add_column('saved_searches', sa.Column('prefilter_skills', postgresql.ARRAY(sa.String(length=128)), nullable=True))
+    op.create_index('ix_saved_searches_prefilter_skills', 'saved_searches', ['prefilter_skills'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_saved_searches_prefilter_skills', table_name='saved_searches')
+    op.drop_column('saved_searches', 'prefilter_skills')
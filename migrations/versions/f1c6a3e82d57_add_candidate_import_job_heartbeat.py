@@ -0,0 +1,29 @@
+"""add candidate import job heartbeat
+
+Revision ID: f1c6a3e82d57
+Revises: e8b4f6a2c913
+Create Date: 2026-10-18 23:41:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6a3e82d57'
+down_revision: Union[str, None] = 'e8b4f6a2c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unfinished jobs from before this revision have no heartbeat; their last update decides whether they are stale
+    op.add_column('candidate_import_jobs', sa.Column('upload_path', sa.Text(), nullable=True))
+    op.add_column('candidate_import_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('candidate_import_jobs', 'heartbeat_at')
+    op.drop_column('candidate_import_jobs', 'upload_path')
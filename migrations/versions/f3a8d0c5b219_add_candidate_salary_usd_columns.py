@@ -0,0 +1,90 @@
+"""add candidate salary usd columns
+
+Revision ID: f3a8d0c5b219
+Revises: e6c1f8a24d97
+Create Date: 2026-10-18 16:48:12.730941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d0c5b219'
+down_revision: Union[str, None] = 'e6c1f8a24d97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# USD value of one unit of each currency when this migration was written; later rate changes apply on write
+USD_EXCHANGE_RATES = {
+    'USD': 1.0,
+    'EUR': 1.08,
+    'GBP': 1.27,
+    'CAD': 0.73,
+    'AUD': 0.66,
+    'CHF': 1.13,
+    'SEK': 0.095,
+    'INR': 0.012,
+    'JPY': 0.0067
+}
+
+
+def _salary_range_usd(salary):
+    """(min, max) of a salary range in USD; a missing bound takes the other, unknown currencies give (None, None)"""
+    if not salary:
+        return None, None
+    rate = USD_EXCHANGE_RATES.get((salary.get('currency') or 'USD').upper())
+    low, high = salary.get('min'), salary.get('max')
+    if rate is None or (low is None and high is None):
+        return None, None
+    low = high if low is None else low
+    high = low if high is None else high
+    return float(low) * rate, float(high) * rate
+
+
+def upgrade() -> None:
+    op.add_column('candidate_profiles', sa.Column('salary_min_usd', sa.Float(), nullable=True))
+    op.add_column('candidate_profiles', sa.Column('salary_max_usd', sa.Float(), nullable=True))
+
+    # Backfill from salary_expectations in id-ordered batches
+    connection = op.get_bind()
+    table = sa.table('candidate_profiles',
+                     sa.column('id', sa.String),
+                     sa.column('salary_expectations', sa.JSON),
+                     sa.column('salary_min_usd', sa.Float),
+                     sa.column('salary_max_usd', sa.Float))
+    last_id = ''
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.salary_expectations)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row_id, salary in rows:
+            low, high = _salary_range_usd(salary)
+            if low is not None:
+                updates.append({'row_id': row_id, 'low': low, 'high': high})
+        if updates:
+            connection.execute(
+                table.update()
+                .where(table.c.id == sa.bindparam('row_id'))
+                .values(salary_min_usd=sa.bindparam('low'), salary_max_usd=sa.bindparam('high')),
+                updates
+            )
+        last_id = rows[-1][0]
+
+    op.create_index('ix_candidate_profiles_salary_usd', 'candidate_profiles', ['salary_min_usd', 'salary_max_usd'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidate_profiles_salary_usd', table_name='candidate_profiles')
+    op.drop_column('candidate_profiles', 'salary_max_usd')
+    op.drop_column('candidate_profiles', 'salary_min_usd')
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 import uuid
 from datetime import datetime
 from db import db
@@ -100,11 +100,17 @@ class CandidateProfile(db.Model):
     email = db.Column(db.String(255), unique=True, nullable=False)
     phone = db.Column(db.String(50), nullable=True)
     location = db.Column(db.String(255), nullable=False)
+    latitude = db.Column(db.Float, nullable=True)  # Geocoded from location on write; null if unknown
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True)
     work_auth_status = db.Column(db.String(32), nullable=False)  # citizen, permanent_resident, visa_holder, needs_sponsorship
     availability = db.Column(db.String(32), nullable=False)  # actively_looking, open_to_opportunities, not_looking
     employment_status = db.Column(db.String(32), nullable=False)  # employed, unemployed, freelancing, student
     salary_expectations = db.Column(db.JSON, nullable=True)  # {min, max, currency}
+    salary_min_usd = db.Column(db.Float, nullable=True)  # Maintained on write from salary_expectations; null if unknown
+    salary_max_usd = db.Column(db.Float, nullable=True)
     skills = db.Column(db.ARRAY(db.String(128)), nullable=False)
+    normalized_skills = db.Column(ARRAY(db.String(128)), nullable=False, server_default='{}')  # Maintained on write from skills
     experience_level = db.Column(db.String(32), nullable=False)  # entry, mid, senior, lead, principal, executive
     bio = db.Column(db.Text, nullable=True)
     linkedin_url = db.Column(db.String(255), nullable=True)
@@ -112,11 +118,32 @@ class CandidateProfile(db.Model):
     certifications = db.Column(db.ARRAY(db.String(255)), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    import_hash = db.Column(db.String(64), nullable=True)  # Hash of the CSV row last imported; delta imports skip unchanged rows
+    # Full-text search document, generated by PostgreSQL; deferred since only queries use it
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(bio, '')), 'B')",
+        persisted=True
+    )))
 
     # Relationships
-    work_experience = db.relationship('WorkExperience', backref='candidate', lazy='dynamic', cascade='all, delete-orphan')
+    work_experience = db.relationship('WorkExperience', backref='candidate', lazy='select', cascade='all, delete-orphan')
     education = db.relationship('Education', backref='candidate', lazy='dynamic', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.Index('ix_candidate_profiles_normalized_skills', 'normalized_skills', postgresql_using='gin'),
+        # Keyset pagination of the candidate list
+        db.Index('ix_candidate_profiles_name_id', 'name', 'id'),
+        db.Index('ix_candidate_profiles_experience_level_id', 'experience_level', 'id'),
+        db.Index('ix_candidate_profiles_location_id', 'location', 'id'),
+        db.Index('ix_candidate_profiles_created_at_id', 'created_at', 'id'),
+        # Salary range overlap filter
+        db.Index('ix_candidate_profiles_salary_usd', 'salary_min_usd', 'salary_max_usd'),
+        # Geohash prefix lookups for radius searches
+        db.Index('ix_candidate_profiles_geohash', 'geohash', postgresql_ops={'geohash': 'varchar_pattern_ops'}),
+        db.Index('ix_candidate_profiles_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
 class WorkExperience(db.Model):
     __tablename__ = 'work_experience'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -128,7 +155,21 @@ class WorkExperience(db.Model):
     end_date = db.Column(db.Date, nullable=True)
     is_current = db.Column(db.Boolean, default=False)
     skills = db.Column(db.ARRAY(db.String(128)), nullable=True)
+    normalized_skills = db.Column(ARRAY(db.String(128)), nullable=False, server_default='{}')  # Maintained on write from skills
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Full-text search document, generated by PostgreSQL; deferred since only queries use it
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(role_description, '')), 'C')",
+        persisted=True
+    )))
+
+    __table_args__ = (
+        db.Index('ix_work_experience_normalized_skills', 'normalized_skills', postgresql_using='gin'),
+        db.Index('ix_work_experience_candidate_id', 'candidate_id'),
+        db.Index('ix_work_experience_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
 class Education(db.Model):
     __tablename__ = 'education'
@@ -148,9 +189,12 @@ class JobPosting(db.Model):
     title = db.Column(db.String(200), nullable=False)
     job_description = db.Column(db.Text, nullable=False)
     required_skills = db.Column(db.ARRAY(db.String(128)), nullable=False)
+    normalized_required_skills = db.Column(ARRAY(db.String(128)), nullable=False, server_default='{}')  # Maintained on write from required_skills
     preferred_skills = db.Column(db.ARRAY(db.String(128)), nullable=True)
     experience_level = db.Column(db.String(32), nullable=False)  # entry, mid, senior, lead, principal, executive
     location = db.Column(db.String(255), nullable=False)
+    latitude = db.Column(db.Float, nullable=True)  # Geocoded from location on write; null if unknown
+    longitude = db.Column(db.Float, nullable=True)
     is_remote = db.Column(db.Boolean, default=False)
     salary_range = db.Column(db.JSON, nullable=False)  # {min, max, currency}
     equity = db.Column(db.JSON, nullable=True)  # {min, max, unit}
@@ -160,9 +204,39 @@ class JobPosting(db.Model):
     status = db.Column(db.String(32), nullable=False, default='active')  # active, paused, closed
     posted_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    matches_refreshed_at = db.Column(db.DateTime, nullable=True)  # Null until matches are (re)computed
 
     # Relationships
     founder = db.relationship('User', backref='job_postings', foreign_keys=[founder_id])
+    matches = db.relationship('JobCandidateMatch', backref='job', lazy='dynamic',
+                              cascade='all, delete-orphan', passive_deletes=True)
+
+    __table_args__ = (
+        # Keyset pagination of a founder's job list
+        db.Index('ix_job_postings_founder_id_posted_at_id', 'founder_id', 'posted_at', 'id'),
+        # Inverted index from required skill to active jobs, for reverse matching
+        db.Index('ix_job_postings_active_normalized_required_skills', 'normalized_required_skills',
+                 postgresql_using='gin', postgresql_where=db.text("status = 'active'")),
+    )
+
+class JobCandidateMatch(db.Model):
+    """Precomputed top-N candidate matches of an active job posting"""
+    __tablename__ = 'job_candidate_matches'
+    job_id = db.Column(db.String(36), db.ForeignKey('job_postings.id', ondelete='CASCADE'), primary_key=True)
+    # No foreign key: rows of deleted candidates are removed by the change listener, which needs to see them
+    candidate_id = db.Column(db.String(36), primary_key=True)
+    match_score = db.Column(db.Float, nullable=False)
+    skills_score = db.Column(db.Float, nullable=False)
+    experience_score = db.Column(db.Float, nullable=False)
+    location_score = db.Column(db.Float, nullable=False)
+    availability_score = db.Column(db.Float, nullable=False)
+    matched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_job_candidate_matches_ranking', 'job_id', 'match_score', 'candidate_id'),
+        db.Index('ix_job_candidate_matches_candidate_id', 'candidate_id'),
+    )
 
 class SavedSearch(db.Model):
     __tablename__ = 'saved_searches'
@@ -172,6 +246,61 @@ class SavedSearch(db.Model):
     search_criteria = db.Column(db.JSON, nullable=False)  # Complete search request as JSON
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_used = db.Column(db.DateTime, nullable=True)
+    results_refreshed_at = db.Column(db.DateTime, nullable=True)  # Null until results are (re)materialized
+    # Maintained on write from search_criteria: skills a candidate must share to qualify; null when anyone may
+    prefilter_skills = db.Column(ARRAY(db.String(128)), nullable=True)
 
     # Relationships
     founder = db.relationship('User', backref='saved_searches', foreign_keys=[founder_id])
+    results = db.relationship('SavedSearchResult', backref='saved_search', lazy='dynamic',
+                              cascade='all, delete-orphan', passive_deletes=True)
+
+    __table_args__ = (
+        # Inverted index from prefilter skill to saved searches, for rescoring written candidates
+        db.Index('ix_saved_searches_prefilter_skills', 'prefilter_skills', postgresql_using='gin'),
+    )
+
+class SavedSearchResult(db.Model):
+    """Materialized top-N ranking of a saved search, maintained as candidates change"""
+    __tablename__ = 'saved_search_results'
+    saved_search_id = db.Column(db.String(36), db.ForeignKey('saved_searches.id', ondelete='CASCADE'), primary_key=True)
+    # No foreign key: rows of deleted candidates are removed by the change listener, which needs to see them
+    candidate_id = db.Column(db.String(36), primary_key=True)
+    match_score = db.Column(db.Float, nullable=False)
+    skills_score = db.Column(db.Float, nullable=False)
+    experience_score = db.Column(db.Float, nullable=False)
+    location_score = db.Column(db.Float, nullable=False)
+    availability_score = db.Column(db.Float, nullable=False)
+    matched_at = db.Column(db.DateTime, default=datetime.utcnow)  # When the candidate entered the results
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_saved_search_results_ranking', 'saved_search_id', 'match_score', 'candidate_id'),
+        db.Index('ix_saved_search_results_candidate_id', 'candidate_id'),
+    )
+
+class CandidateImportJob(db.Model):
+    """Background Bullhorn CSV import and its progress"""
+    __tablename__ = 'candidate_import_jobs'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    founder_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(32), nullable=False, default='queued')  # queued, running, completed, failed, cancelled
+    mode = db.Column(db.String(16), nullable=False, default='insert')  # insert (skip existing emails) or delta (update changed rows)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    imported = db.Column(db.Integer, nullable=False, default=0)
+    updated = db.Column(db.Integer, nullable=False, default=0)  # Existing candidates changed by a delta import
+    skipped = db.Column(db.Integer, nullable=False, default=0)  # Existing or repeated emails; in delta mode, unchanged rows
+    errors = db.Column(db.Integer, nullable=False, default=0)
+    error_details = db.Column(db.JSON, nullable=True)  # First few per-row error messages
+    error = db.Column(db.Text, nullable=True)  # Why a failed job stopped
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    upload_path = db.Column(db.Text, nullable=True)  # Spooled CSV on the host that accepted the upload
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # Last time the owning process reported the job alive
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    founder = db.relationship('User', backref='candidate_import_jobs', foreign_keys=[founder_id])
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 from models import JobPosting, User
 from schemas.hiring import JobPostingInput, JobPosting as JobPostingSchema
-from schemas import job_posting_to_dict, create_pagination_dict
+from schemas import job_posting_to_dict, candidate_match_to_dict, create_pagination_dict
 from services.hiring import HiringMatchingService
+from services.materialized_matches import job_matches
 from utils.auth import require_auth, get_current_user
 from db import db
 from pydantic import ValidationError
@@ -50,7 +51,7 @@ def create_job():
             employment_type=job_input.employment_type,
             department=job_input.department,
             team=job_input.team,
-            status='active',
+            status=job_input.status or 'active',
             posted_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
@@ -59,6 +60,10 @@ def create_job():
         db.session.add(job_posting)
         db.session.commit()
 
+        # Precompute candidate matches for active jobs
+        if job_posting.status == 'active':
+            job_matches.refresh(job_posting)
+
         # Convert to API response format
         job_data = job_posting_to_dict(job_posting)
 
@@ -83,6 +88,7 @@ def get_jobs():
         page = request.args.get('page', 1, type=int)
         limit = min(request.args.get('limit', 20, type=int), 50)  # Cap at 50
         status = request.args.get('status')
+        cursor = request.args.get('cursor')
 
         # Validate parameters
         if page < 1:
@@ -93,12 +99,16 @@ def get_jobs():
             return jsonify({'error': 'Invalid status filter'}), 400
 
         # Get jobs using service
-        result = HiringMatchingService.get_job_postings_list(
-            founder_id=current_user.id,
-            page=page,
-            limit=limit,
-            status=status
-        )
+        try:
+            result = HiringMatchingService.get_job_postings_list(
+                founder_id=current_user.id,
+                page=page,
+                limit=limit,
+                status=status,
+                cursor=cursor
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Convert to API response format
         jobs_data = [job_posting_to_dict(job) for job in result['jobs']]
@@ -186,11 +196,19 @@ def update_job(job_id):
         job_posting.employment_type = job_input.employment_type
         job_posting.department = job_input.department
         job_posting.team = job_input.team
+        if job_input.status:
+            job_posting.status = job_input.status
         job_posting.updated_at = datetime.utcnow()
 
         # Save to database
         db.session.commit()
 
+        # Recompute matches of active jobs and drop those of paused or closed ones
+        if job_posting.status == 'active':
+            job_matches.refresh(job_posting)
+        else:
+            job_matches.clear(job_posting)
+
         # Convert to API response format
         job_data = job_posting_to_dict(job_posting)
 
@@ -201,6 +219,52 @@ def update_job(job_id):
         db.session.rollback()
         return jsonify({'error': 'Internal server error'}), 500
 
+@jobs_bp.route('/jobs/<job_id>/matches', methods=['GET'])
+@require_auth
+def get_job_matches(job_id):
+    """Get the precomputed ranked candidate matches of an active job posting"""
+    try:
+        # Get current user
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+
+        # Get query parameters
+        page = request.args.get('page', 1, type=int)
+        limit = min(request.args.get('limit', 20, type=int), 100)  # Cap at 100
+
+        # Validate parameters
+        if page < 1:
+            return jsonify({'error': 'Page must be >= 1'}), 400
+        if limit < 1:
+            return jsonify({'error': 'Limit must be >= 1'}), 400
+
+        # Find job posting
+        job_posting = db.session.query(JobPosting).filter(
+            JobPosting.id == job_id,
+            JobPosting.founder_id == current_user.id
+        ).first()
+
+        if not job_posting:
+            return jsonify({'error': 'Job posting not found'}), 404
+        if job_posting.status != 'active':
+            return jsonify({'error': 'Matches are only available for active job postings'}), 400
+
+        result = job_matches.page(job_posting, page, limit)
+
+        response = {
+            'candidates': [candidate_match_to_dict(item) for item in result['candidates']],
+            'pagination': result['pagination'],
+            'refreshedAt': job_posting.matches_refreshed_at.isoformat() if job_posting.matches_refreshed_at else None
+        }
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        logger.error(f"Error getting matches of job {job_id}: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
 @jobs_bp.route('/jobs/<job_id>', methods=['DELETE'])
 @require_auth
 def delete_job(job_id):
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from models import SavedSearch, User
 from schemas.hiring import SavedSearchInput, SavedSearch as SavedSearchSchema
-from schemas import saved_search_to_dict
+from schemas import saved_search_to_dict, candidate_match_to_dict, format_datetime
+from services.hiring import HiringMatchingService
+from services.materialized_matches import saved_search_results
 from utils.auth import require_auth, get_current_user
 from db import db
 from pydantic import ValidationError
@@ -34,6 +36,11 @@ def create_saved_search():
             logger.error(f"Validation error in saved search creation: {e}")
             return jsonify({'error': 'Invalid search data', 'details': e.errors()}), 400
 
+        try:
+            HiringMatchingService.validate_search_filters(search_input.search_criteria.dict())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         # Create saved search
         saved_search = SavedSearch(
             founder_id=current_user.id,
@@ -47,6 +54,9 @@ def create_saved_search():
         db.session.add(saved_search)
         db.session.commit()
 
+        # Materialize its ranked results
+        saved_search_results.refresh(saved_search)
+
         # Convert to API response format
         search_data = saved_search_to_dict(saved_search)
 
@@ -113,6 +123,76 @@ def get_saved_search(search_id):
         logger.error(f"Error getting saved search {search_id}: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@searches_bp.route('/searches/<search_id>/results', methods=['GET'])
+@require_auth
+def get_saved_search_results(search_id):
+    """Get the materialized ranked results of a saved search.
+
+    With ``?new=true`` only candidates that entered the results since the
+    search was last used are returned. Later pages of that view pass the
+    returned ``newSince`` back as ``since`` so the view stays the same while
+    it is paged; such requests do not count as using the search.
+    """
+    try:
+        # Get current user
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+
+        # Get query parameters
+        page = request.args.get('page', 1, type=int)
+        limit = min(request.args.get('limit', 20, type=int), 100)  # Cap at 100
+        only_new = request.args.get('new', '').lower() == 'true'
+        since = request.args.get('since')
+
+        # Validate parameters
+        if page < 1:
+            return jsonify({'error': 'Page must be >= 1'}), 400
+        if limit < 1:
+            return jsonify({'error': 'Limit must be >= 1'}), 400
+        if since:
+            try:
+                since = datetime.fromisoformat(since)
+            except ValueError:
+                return jsonify({'error': 'Since must be an ISO 8601 timestamp'}), 400
+
+        # Find saved search
+        saved_search = db.session.query(SavedSearch).filter(
+            SavedSearch.id == search_id,
+            SavedSearch.founder_id == current_user.id
+        ).first()
+
+        if not saved_search:
+            return jsonify({'error': 'Saved search not found'}), 404
+
+        if since:
+            new_since = since
+        elif only_new:
+            # Never used: every result is new, and results are only materialized after the search is created
+            new_since = saved_search.last_used or saved_search.created_at
+        else:
+            new_since = None
+        result = saved_search_results.page(saved_search, page, limit, since=new_since)
+
+        # Update last used timestamp, unless this pages a view pinned to an earlier one
+        if not since:
+            saved_search.last_used = datetime.utcnow()
+            db.session.commit()
+
+        response = {
+            'candidates': [candidate_match_to_dict(item) for item in result['candidates']],
+            'pagination': result['pagination'],
+            'newSince': format_datetime(new_since),
+            'refreshedAt': format_datetime(saved_search.results_refreshed_at)
+        }
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        logger.error(f"Error getting results of saved search {search_id}: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
 @searches_bp.route('/searches/<search_id>', methods=['DELETE'])
 @require_auth
 def delete_saved_search(search_id):
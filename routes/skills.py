@@ -0,0 +1,36 @@
+from flask import Blueprint, current_app, jsonify
+from services.skill_taxonomy import skill_taxonomy
+from utils.auth import require_ops_token
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+skills_bp = Blueprint('skills', __name__)
+
+@skills_bp.route('/skills/taxonomy/reload', methods=['POST'])
+@require_ops_token
+def reload_skill_taxonomy():
+    """Reload the skill taxonomy data file without a restart (ops only)
+
+    The file is loaded before responding; renormalizing stored skills and
+    rebuilding the scoring indexes, pools and caches continue in the
+    background. Only the process that receives the request reloads, so
+    with several server processes send it to each of them or restart.
+    """
+    try:
+        if not skill_taxonomy.reload_in_background(current_app._get_current_object()):
+            return jsonify({'error': 'A skill taxonomy reload is already in progress'}), 409
+
+        response = {
+            'skills': skill_taxonomy.skill_count,
+            'aliases': len(skill_taxonomy.aliases()),
+            'reloadedAt': datetime.utcnow().isoformat(),
+            'rebuilding': True
+        }
+
+        return jsonify(response), 202
+
+    except Exception as e:
+        logger.error(f"Error reloading skill taxonomy: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
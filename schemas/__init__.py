@@ -186,6 +186,55 @@ def detailed_candidate_profile_to_dict(candidate_profile) -> Dict[str, Any]:
 
     return result
 
+def match_breakdown_to_dict(match_breakdown) -> Dict[str, Any]:
+    """Convert a HiringMatchingService match breakdown to API response dict"""
+    return {
+        'skillsMatch': {
+            'score': match_breakdown['skills_match']['score'],
+            'matchedSkills': match_breakdown['skills_match']['matched_skills'],
+            'missingSkills': match_breakdown['skills_match']['missing_skills'],
+            'matchedCount': match_breakdown['skills_match']['matched_count'],
+            'totalRequired': match_breakdown['skills_match']['total_required']
+        },
+        'experienceMatch': {
+            'score': match_breakdown['experience_match']['score'],
+            'reasoning': match_breakdown['experience_match']['reasoning']
+        },
+        'locationMatch': {
+            'score': match_breakdown['location_match']['score'],
+            'distance': match_breakdown['location_match']['distance']
+        },
+        'availabilityMatch': {
+            'score': match_breakdown['availability_match']['score'],
+            'status': match_breakdown['availability_match']['status']
+        },
+        'aiRanking': {
+            'score': match_breakdown['ai_ranking']['score'],
+            'reasoning': match_breakdown['ai_ranking']['reasoning']
+        } if match_breakdown.get('ai_ranking') else None
+    }
+
+def candidate_match_to_dict(item) -> Dict[str, Any]:
+    """Convert a matched candidate item from HiringMatchingService to API response dict"""
+    candidate = item['candidate']
+    match_score = item['match_score']
+    match_breakdown = item['match_breakdown']
+    recent_experience = item['recent_experience']
+
+    # Base candidate data
+    candidate_data = candidate_profile_to_dict(candidate)
+
+    # Add match information
+    candidate_data['matchScore'] = match_score
+    candidate_data['matchBreakdown'] = match_breakdown_to_dict(match_breakdown)
+
+    # Add recent experience
+    candidate_data['recentExperience'] = [
+        work_experience_to_dict(exp) for exp in recent_experience
+    ]
+
+    return candidate_data
+
 def job_posting_to_dict(job_posting) -> Dict[str, Any]:
     """Convert JobPosting model to API response dict"""
     if not job_posting:
@@ -211,6 +260,13 @@ def job_posting_to_dict(job_posting) -> Dict[str, Any]:
         'updatedAt': format_datetime(job_posting.updated_at)
     }
 
+def job_match_to_dict(item) -> Dict[str, Any]:
+    """Convert a matched job item from HiringMatchingService to API response dict"""
+    job_data = job_posting_to_dict(item['job'])
+    job_data['matchScore'] = item['match_score']
+    job_data['matchBreakdown'] = match_breakdown_to_dict(item['match_breakdown'])
+    return job_data
+
 def saved_search_to_dict(saved_search) -> Dict[str, Any]:
     """Convert SavedSearch model to API response dict"""
     if not saved_search:
@@ -225,6 +281,29 @@ def saved_search_to_dict(saved_search) -> Dict[str, Any]:
         'lastUsed': format_datetime(saved_search.last_used)
     }
 
+def import_job_to_dict(import_job) -> Dict[str, Any]:
+    """Convert CandidateImportJob model to API response dict"""
+    if not import_job:
+        return {}
+
+    return {
+        'id': import_job.id,
+        'filename': import_job.filename,
+        'status': import_job.status,
+        'mode': import_job.mode,
+        'rowsProcessed': import_job.rows_processed,
+        'imported': import_job.imported,
+        'updated': import_job.updated,
+        'skipped': import_job.skipped,
+        'errors': import_job.errors,
+        'errorDetails': import_job.error_details or [],
+        'error': import_job.error,
+        'cancelRequested': import_job.cancel_requested,
+        'createdAt': format_datetime(import_job.created_at),
+        'startedAt': format_datetime(import_job.started_at),
+        'finishedAt': format_datetime(import_job.finished_at)
+    }
+
 def create_pagination_dict(page: int, limit: int, total: int) -> Dict[str, Any]:
     """Create pagination metadata dict"""
     total_pages = (total + limit - 1) // limit  # Ceiling division
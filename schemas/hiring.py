@@ -119,6 +119,7 @@ class JobPostingInput(BaseModel):
     employment_type: EmploymentType = Field(..., alias="employmentType")
     department: str
     team: Optional[str] = None
+    status: Optional[JobStatus] = None  # Unchanged on update when omitted
 
     class Config:
         populate_by_name = True
@@ -148,7 +149,8 @@ class SearchFilters(BaseModel):
     work_auth_status: Optional[List[WorkAuthStatus]] = Field(None, alias="workAuthStatus")
     salary_range: Optional[SalaryRange] = Field(None, alias="salaryRange")
     location: Optional[str] = None
-    max_distance: Optional[float] = Field(None, alias="maxDistance")
+    max_distance: Optional[float] = Field(None, ge=0, alias="maxDistance")  # Miles from location, else the job location
+    keywords: Optional[str] = Field(None, max_length=500)  # Full-text query over bios and work experience
 
     class Config:
         populate_by_name = True
@@ -157,6 +159,7 @@ class MatchingCriteria(BaseModel):
     skill_match_threshold: float = Field(default=70, ge=0, le=100, alias="skillMatchThreshold")
     min_match_score: float = Field(default=60, ge=0, le=100, alias="minMatchScore")
     use_ai_ranking: bool = Field(default=True, alias="useAIRanking")
+    scoring_mode: str = Field(default="python", pattern="^(python|sql|vectorized|parallel)$", alias="scoringMode")
 
     class Config:
         populate_by_name = True
@@ -164,9 +167,10 @@ class MatchingCriteria(BaseModel):
 class SearchPagination(BaseModel):
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None  # next_cursor of a previous page; takes precedence over page
 
 class SearchSort(BaseModel):
-    field: str = Field(default="match_score", pattern="^(match_score|experience|name|availability)$")
+    field: str = Field(default="match_score", pattern="^(match_score|experience|name|availability|relevance)$")
     order: str = Field(default="desc", pattern="^(asc|desc)$")
 
 class CandidateSearchRequest(BaseModel):
@@ -179,6 +183,13 @@ class CandidateSearchRequest(BaseModel):
     class Config:
         populate_by_name = True
 
+class StreamSearchPagination(SearchPagination):
+    limit: int = Field(default=100, ge=1, le=5000)
+
+class CandidateSearchStreamRequest(CandidateSearchRequest):
+    """Search request for NDJSON streaming, which allows much larger pages"""
+    pagination: Optional[StreamSearchPagination] = None
+
 # Match scoring schemas
 class SkillsMatch(BaseModel):
     score: float = Field(..., ge=0, le=100)
@@ -196,7 +207,7 @@ class ExperienceMatch(BaseModel):
 
 class LocationMatch(BaseModel):
     score: float = Field(..., ge=0, le=100)
-    distance: Optional[float] = None
+    distance: Optional[float] = None  # Miles, when both locations are geocoded
 
 class AvailabilityMatch(BaseModel):
     score: float = Field(..., ge=0, le=100)
@@ -0,0 +1,430 @@
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from models import CandidateProfile, WorkExperience, Education
+from db import db
+from services import model_events
+from services.hiring import HiringMatchingService
+from services.import_mapping import import_mapping_executor
+from sqlalchemy import any_, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, date
+import csv
+import hashlib
+import io
+import json
+import logging
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Error messages kept in an import summary; every error is still counted
+MAX_ERROR_DETAILS = 10
+
+
+class CandidateImportService:
+    """Bulk import of candidates from Bullhorn CSV exports"""
+
+    @staticmethod
+    def import_csv(stream: BinaryIO, batch_size: int = 500,
+                   on_batch: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                   delta: bool = False) -> Dict[str, Any]:
+        """Import a CSV upload stream in batches and return the import summary.
+
+        The stream is decoded incrementally, so memory is bounded by
+        ``batch_size`` rather than the file size. Batches are mapped on the
+        import mapping pool when it is enabled, overlapping with the inserts
+        of earlier batches. Each batch is committed on its own, then passed
+        to ``on_batch`` with the running summary; a False return stops the
+        import with ``cancelled`` set. An undecodable file stops it with
+        ``decode_error`` set. Either way, batches committed before the stop
+        stay imported.
+
+        By default rows whose email is already stored are skipped. With
+        ``delta``, they are compared by content hash instead: unchanged rows
+        are skipped without a write and changed ones update the stored
+        candidate, so a re-import only costs what changed.
+        """
+        summary = {'imported': 0, 'updated': 0, 'skipped': 0, 'errors': 0, 'error_details': [],
+                   'decode_error': None, 'cancelled': False}
+        text_stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        batches = CandidateImportService._read_batches(csv.DictReader(text_stream), batch_size)
+        if import_mapping_executor.enabled:
+            mapped_batches = import_mapping_executor.map_batches(batches)
+        else:
+            mapped_batches = (CandidateImportService.map_rows(batch) for batch in batches)
+        try:
+            for mapped in mapped_batches:
+                CandidateImportService.write_batch(mapped, summary, delta)
+                if on_batch is not None and not on_batch(summary):
+                    summary['cancelled'] = True
+                    break
+        except UnicodeDecodeError as e:
+            db.session.rollback()
+            summary['decode_error'] = str(e)
+        finally:
+            mapped_batches.close()
+            # Leave the upload stream to its owner
+            text_stream.detach()
+
+        summary['total_rows'] = summary['imported'] + summary['updated'] + summary['errors']
+        summary['rows_processed'] = summary['total_rows'] + summary['skipped']
+        return summary
+
+    @staticmethod
+    def _read_batches(reader: Iterable[Dict[str, str]], batch_size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+        batch: List[Tuple[int, Dict[str, str]]] = []
+        for row_num, row in enumerate(reader, start=2):  # Start at 2 because row 1 is headers
+            batch.append((row_num, row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def map_rows(rows: Iterable[Tuple[int, Dict[str, str]]]) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """Map and prepare a batch of (row number, CSV row) pairs without touching the database.
+
+        Returns (row number, prepared rows, None) per mapped row and
+        (row number, None, error message) per row that failed to map.
+        """
+        mapped = []
+        for row_num, row in rows:
+            try:
+                # Map Bullhorn fields to our model
+                candidate_rows = CandidateImportService.prepare_rows(map_bullhorn_to_candidate(row))
+                candidate_rows['profile']['import_hash'] = CandidateImportService.row_hash(row)
+                mapped.append((row_num, candidate_rows, None))
+            except Exception as e:
+                mapped.append((row_num, None, str(e)))
+        return mapped
+
+    @staticmethod
+    def row_hash(row: Dict[str, str]) -> str:
+        """Content hash of a CSV row, independent of column order"""
+        content = json.dumps(sorted((str(key), value) for key, value in row.items()), separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def write_batch(mapped: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]], summary: Dict[str, Any],
+                    delta: bool = False):
+        """Dedup and write one batch of mapped rows, then commit.
+
+        Stored emails are looked up with one ``email = ANY(...)`` query; rows
+        repeating an email seen earlier in the file are skipped. Stored
+        candidates are skipped too, unless ``delta`` is set and the row's
+        hash differs from the stored one. The rows are written with
+        multi-row INSERTs; if that fails, the batch is retried row by row so
+        only the failing rows are reported.
+        """
+        candidates = []
+        for row_num, candidate_rows, error in mapped:
+            if error is not None:
+                CandidateImportService._record_error(summary, row_num, error)
+            else:
+                candidates.append((row_num, candidate_rows))
+        if not candidates:
+            return
+
+        emails = list({candidate_rows['profile']['email'] for _, candidate_rows in candidates})
+        existing = {email: (candidate_id, import_hash) for email, candidate_id, import_hash in db.session.execute(
+            select(CandidateProfile.email, CandidateProfile.id, CandidateProfile.import_hash)
+            .where(CandidateProfile.email == any_(emails))
+        )}
+
+        seen = set()
+        prepared = []
+        for row_num, candidate_rows in candidates:
+            email = candidate_rows['profile']['email']
+            if email in seen:
+                logger.info(f"Candidate with email {email} repeated in the file, skipping")
+                summary['skipped'] += 1
+                continue
+            seen.add(email)
+            if email in existing:
+                candidate_id, import_hash = existing[email]
+                if not delta:
+                    logger.info(f"Candidate with email {email} already exists, skipping")
+                    summary['skipped'] += 1
+                    continue
+                if import_hash == candidate_rows['profile']['import_hash']:
+                    summary['skipped'] += 1
+                    continue
+                candidate_rows = CandidateImportService._for_existing(candidate_rows, candidate_id)
+            prepared.append((row_num, candidate_rows))
+
+        try:
+            with db.session.begin_nested():
+                CandidateImportService.insert_rows([candidate_rows for _, candidate_rows in prepared], upsert=delta)
+            written = prepared
+        except Exception:
+            # Find the failing rows; each retry only rolls back its own savepoint
+            written = []
+            for row_num, candidate_rows in prepared:
+                try:
+                    with db.session.begin_nested():
+                        CandidateImportService.insert_rows([candidate_rows], upsert=delta)
+                    written.append((row_num, candidate_rows))
+                except Exception as e:
+                    CandidateImportService._record_error(summary, row_num, e)
+
+        db.session.commit()
+        updated = sum(1 for _, candidate_rows in written if candidate_rows['existing'])
+        summary['imported'] += len(written) - updated
+        summary['updated'] += updated
+
+        # Core inserts bypass the ORM unit of work, so report the written candidates explicitly
+        model_events.notify(CandidateProfile, [candidate_rows['profile']['id'] for _, candidate_rows in written])
+
+    @staticmethod
+    def prepare_rows(candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a mapped candidate with client-side ids.
+
+        Fills the columns the ORM write listeners would otherwise maintain:
+        normalized skills, coordinates and the USD salary range.
+        """
+        profile = dict(candidate_data['profile'], id=str(uuid.uuid4()))
+        profile['normalized_skills'] = HiringMatchingService.normalize_skills(profile.get('skills'))
+        profile.update(HiringMatchingService.geocode_location(profile.get('location')))
+        profile['salary_min_usd'], profile['salary_max_usd'] = HiringMatchingService.salary_range_usd(
+            profile.get('salary_expectations'))
+
+        work_experience = [
+            dict(exp_data, id=str(uuid.uuid4()), candidate_id=profile['id'],
+                 normalized_skills=HiringMatchingService.normalize_skills(exp_data.get('skills')))
+            for exp_data in candidate_data['work_experience']
+        ]
+        education = [
+            dict(edu_data, id=str(uuid.uuid4()), candidate_id=profile['id'])
+            for edu_data in candidate_data['education']
+        ]
+        return {'profile': profile, 'work_experience': work_experience, 'education': education, 'existing': False}
+
+    @staticmethod
+    def _for_existing(candidate_rows: Dict[str, Any], candidate_id: str) -> Dict[str, Any]:
+        """Point prepared rows at a stored candidate they will replace"""
+        return {
+            'profile': dict(candidate_rows['profile'], id=candidate_id),
+            'work_experience': [dict(exp_data, candidate_id=candidate_id) for exp_data in candidate_rows['work_experience']],
+            'education': [dict(edu_data, candidate_id=candidate_id) for edu_data in candidate_rows['education']],
+            'existing': True
+        }
+
+    @staticmethod
+    def insert_rows(candidates: List[Dict[str, Any]], upsert: bool = False):
+        """Write prepared candidates with one multi-row INSERT per table.
+
+        With ``upsert``, profiles are written with ``INSERT ... ON CONFLICT
+        (email) DO UPDATE`` and the work experience and education of
+        existing candidates are replaced by the imported rows.
+        """
+        profiles = [candidate['profile'] for candidate in candidates]
+        work_experience = [exp_data for candidate in candidates for exp_data in candidate['work_experience']]
+        education = [edu_data for candidate in candidates for edu_data in candidate['education']]
+
+        if profiles and upsert:
+            replaced_ids = [candidate['profile']['id'] for candidate in candidates if candidate['existing']]
+            if replaced_ids:
+                db.session.execute(delete(WorkExperience).where(WorkExperience.candidate_id == any_(replaced_ids)))
+                db.session.execute(delete(Education).where(Education.candidate_id == any_(replaced_ids)))
+            statement = pg_insert(CandidateProfile)
+            statement = statement.on_conflict_do_update(
+                index_elements=[CandidateProfile.email],
+                set_={column: statement.excluded[column] for column in profiles[0] if column not in ('id', 'email', 'created_at')}
+            )
+            db.session.execute(statement, profiles)
+        elif profiles:
+            db.session.execute(insert(CandidateProfile), profiles)
+        if work_experience:
+            db.session.execute(insert(WorkExperience), work_experience)
+        if education:
+            db.session.execute(insert(Education), education)
+
+    @staticmethod
+    def _record_error(summary: Dict[str, Any], row_num: int, error: Union[Exception, str]):
+        summary['errors'] += 1
+        if len(summary['error_details']) < MAX_ERROR_DETAILS:
+            summary['error_details'].append(f"Row {row_num}: {str(error)}")
+        logger.error(f"Error importing row {row_num}: {str(error)}")
+
+
+def map_bullhorn_to_candidate(row):
+    """Map Bullhorn CSV row to our candidate model"""
+
+    # Helper functions for mapping
+    def safe_get(key, default=''):
+        return row.get(key, default) or default
+
+    def parse_skills(skill_text):
+        """Parse skills from text description"""
+        if not skill_text:
+            return []
+        # Split by common separators and clean up
+        skills = re.split(r'[,;\n\r\t]+', skill_text)
+        return [skill.strip() for skill in skills if skill.strip()]
+
+    def map_work_authorization(work_auth):
+        """Map Bullhorn work authorization to our enum"""
+        if not work_auth:
+            return 'needs_sponsorship'
+
+        work_auth_lower = str(work_auth).lower()
+        if work_auth_lower in ['true', '1', 'yes', 'authorized']:
+            return 'citizen'  # Assume citizen if authorized
+        return 'needs_sponsorship'
+
+    def map_availability(status):
+        """Map Bullhorn status to our availability enum"""
+        if not status:
+            return 'not_looking'
+
+        status_lower = str(status).lower()
+        if 'active' in status_lower or 'looking' in status_lower:
+            return 'actively_looking'
+        elif 'available' in status_lower or 'open' in status_lower:
+            return 'open_to_opportunities'
+        return 'not_looking'
+
+    def map_employment_status(employment_pref):
+        """Map employment preference to our enum"""
+        if not employment_pref:
+            return 'employed'
+
+        pref_lower = str(employment_pref).lower()
+        if 'unemployed' in pref_lower or 'not working' in pref_lower:
+            return 'unemployed'
+        elif 'freelance' in pref_lower or 'contractor' in pref_lower:
+            return 'freelancing'
+        elif 'student' in pref_lower:
+            return 'student'
+        return 'employed'
+
+    def map_experience_level(years_exp):
+        """Map years of experience to our level enum"""
+        if not years_exp:
+            return 'entry'
+
+        try:
+            years = int(years_exp)
+            if years < 2:
+                return 'entry'
+            elif years < 5:
+                return 'mid'
+            elif years < 10:
+                return 'senior'
+            elif years < 15:
+                return 'lead'
+            elif years < 20:
+                return 'principal'
+            else:
+                return 'executive'
+        except:
+            return 'entry'
+
+    def parse_address(address_obj):
+        """Parse address composite into location string"""
+        if not address_obj:
+            return ''
+
+        # If it's a string, return as-is
+        if isinstance(address_obj, str):
+            return address_obj
+
+        # Try to parse as composite
+        parts = []
+        if isinstance(address_obj, dict):
+            city = address_obj.get('city', '')
+            state = address_obj.get('state', '')
+            if city:
+                parts.append(city)
+            if state:
+                parts.append(state)
+
+        return ', '.join(parts) if parts else str(address_obj)
+
+    def parse_salary_expectations(salary, salary_low):
+        """Parse salary expectations"""
+        try:
+            min_salary = float(salary_low) if salary_low else None
+            max_salary = float(salary) if salary else None
+
+            if min_salary or max_salary:
+                return {
+                    'min': min_salary,
+                    'max': max_salary,
+                    'currency': 'USD'
+                }
+        except:
+            pass
+        return None
+
+    # Build full name
+    first_name = safe_get('firstName')
+    last_name = safe_get('lastName')
+    middle_name = safe_get('middleName')
+
+    full_name = f"{first_name} {middle_name} {last_name}".strip()
+    if not full_name:
+        full_name = safe_get('name')
+
+    # Get primary contact info
+    email = safe_get('email')
+    phone = safe_get('mobile') or safe_get('phone') or safe_get('workPhone')
+
+    # Parse location
+    location = parse_address(safe_get('address')) or safe_get('desiredLocations', 'Unknown')
+
+    # Parse skills
+    skills = parse_skills(safe_get('skillSet'))
+
+    # Build candidate profile
+    candidate_profile = {
+        'name': full_name,
+        'email': email,
+        'phone': phone,
+        'location': location,
+        'work_auth_status': map_work_authorization(safe_get('workAuthorized')),
+        'availability': map_availability(safe_get('status')),
+        'employment_status': map_employment_status(safe_get('employmentPreference')),
+        'salary_expectations': parse_salary_expectations(safe_get('salary'), safe_get('salaryLow')),
+        'skills': skills,
+        'experience_level': map_experience_level(safe_get('experience')),
+        'bio': safe_get('description'),
+        'linkedin_url': safe_get('companyURL') if 'linkedin' in safe_get('companyURL').lower() else None,
+        'portfolio_url': safe_get('companyURL') if 'linkedin' not in safe_get('companyURL').lower() else None,
+        'certifications': parse_skills(safe_get('certifications')),
+        'created_at': datetime.utcnow(),
+        'updated_at': datetime.utcnow()
+    }
+
+    # Build work experience (if we have current company info)
+    work_experience = []
+    if safe_get('companyName') and safe_get('occupation'):
+        work_experience.append({
+            'title': safe_get('occupation'),
+            'company': safe_get('companyName'),
+            'role_description': safe_get('description', 'No description available'),
+            'start_date': date.today(),  # We don't have start date, use today
+            'end_date': None,
+            'is_current': True,
+            'skills': skills[:5] if skills else [],  # Use first 5 skills
+            'created_at': datetime.utcnow()
+        })
+
+    # Build education
+    education = []
+    if safe_get('educationDegree'):
+        education.append({
+            'degree': safe_get('educationDegree'),
+            'institution': 'Unknown',  # Bullhorn doesn't seem to have institution field
+            'field_of_study': safe_get('degreeList', 'Unknown'),
+            'graduation_year': None,
+            'gpa': None,
+            'created_at': datetime.utcnow()
+        })
+
+    return {
+        'profile': candidate_profile,
+        'work_experience': work_experience,
+        'education': education
+    }
@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from sqlalchemy import DateTime, and_, or_
+import base64
+import json
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode a cursor payload as an opaque URL-safe token"""
+    data = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a token from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(data.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(payload, dict):
+        raise ValueError('Invalid cursor')
+    return payload
+
+
+def keyset_cursor(row, sort_column, id_column) -> str:
+    """Cursor pointing just past ``row`` in (sort column, id) order"""
+    value = getattr(row, sort_column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor({'v': value, 'id': getattr(row, id_column.key)})
+
+
+def keyset_filter(cursor: str, sort_column, id_column, descending: bool = False):
+    """Filter selecting the rows after a keyset cursor.
+
+    Rows are ordered by ``sort_column`` and then by id in the same
+    direction, so one (sort column, id) index serves both directions. NULLs
+    sort last ascending and first descending, as in PostgreSQL.
+    """
+    payload = decode_cursor(cursor)
+    if 'id' not in payload:
+        raise ValueError('Invalid cursor')
+    value: Optional[Any] = payload.get('v')
+    last_id = payload['id']
+    if value is not None and isinstance(sort_column.type, DateTime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid cursor')
+
+    id_after = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        same_value = and_(sort_column.is_(None), id_after)
+        # NULLs come first descending, so every non-NULL row is still ahead
+        return or_(same_value, sort_column.isnot(None)) if descending else same_value
+
+    after = sort_column < value if descending else sort_column > value
+    same_value = and_(sort_column == value, id_after)
+    if descending:
+        return or_(after, same_value)
+    return or_(after, same_value, sort_column.is_(None))
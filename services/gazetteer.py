@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import math
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      'data', 'gazetteer.json')
+
+# Bound on memoized raw location strings; the cache is cleared when it fills up
+MAX_MEMOIZED_LOCATIONS = 100000
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Geohash length stored per candidate (~38m x 19m cells)
+GEOHASH_PRECISION = 8
+# Most geohash prefixes a radius search ORs together before it skips the prefilter
+MAX_COVER_CELLS = 16
+
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+_POSTAL_CODE = re.compile(r'\s+\d{5}(-\d{4})?$')
+
+Point = Tuple[float, float]
+
+
+class Gazetteer:
+    """Offline city gazetteer resolving free-text locations to coordinates.
+
+    The data file lists places as "city, region" with their latitude,
+    longitude and aliases. Lookups are case and whitespace insensitive,
+    accept full region names ("Austin, Texas"), trailing postal codes and a
+    trailing US country name. Unknown locations resolve to None.
+    """
+
+    def __init__(self, path: str = DEFAULT_GAZETTEER_PATH):
+        self._path = path
+        self._lock = threading.Lock()
+        # (place table, memo) swapped together so a memo never mixes gazetteer versions
+        self._tables: Tuple[Dict[str, Point], Dict[str, Optional[Point]]] = ({}, {})
+        self._regions: Dict[str, str] = {}
+        self._countries: frozenset = frozenset()
+        self._loaded = False
+
+    def init_app(self, app):
+        self._path = app.config.get('GAZETTEER_PATH', self._path)
+        self.load()
+
+    def load(self):
+        """Compile the gazetteer file into a lookup table"""
+        with open(self._path) as f:
+            data = json.load(f)
+
+        places: Dict[str, Point] = {}
+        for name, entry in data.get('places', {}).items():
+            point = (float(entry['lat']), float(entry['lon']))
+            for alias in [name] + list(entry.get('aliases', [])):
+                places.setdefault(self._clean(alias), point)
+
+        with self._lock:
+            self._regions = {name.lower(): code.lower() for name, code in data.get('regions', {}).items()}
+            self._countries = frozenset(country.lower() for country in data.get('countries', []))
+            self._tables = (places, {})
+            self._loaded = True
+
+        logger.info(f"Loaded gazetteer from {self._path}: {len(data.get('places', {}))} places, {len(places)} names")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    @staticmethod
+    def _clean(location: str) -> str:
+        parts = [' '.join(part.split()) for part in location.lower().split(',')]
+        return ', '.join(part for part in parts if part)
+
+    def resolve(self, location: Optional[str]) -> Optional[Point]:
+        """Resolve a raw location string to (latitude, longitude), or None if unknown"""
+        if not location:
+            return None
+        self._ensure_loaded()
+        places, memo = self._tables
+        if location in memo:
+            return memo[location]
+
+        parts = self._clean(location).split(', ')
+        if len(parts) > 1 and parts[-1] in self._countries:
+            parts.pop()
+        parts[-1] = _POSTAL_CODE.sub('', parts[-1])
+        if len(parts) > 1:
+            parts[-1] = self._regions.get(parts[-1], parts[-1])
+        point = places.get(', '.join(parts))
+
+        if len(memo) >= MAX_MEMOIZED_LOCATIONS:
+            memo.clear()
+        memo[location] = point
+        return point
+
+
+def distance_miles(origin: Point, destination: Point) -> float:
+    """Great-circle (haversine) distance between two points in miles"""
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lon2 = math.radians(destination[0]), math.radians(destination[1])
+    a = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_miles_expr(latitude_column, longitude_column, origin: Point):
+    """SQL haversine distance in miles from ``origin``, NULL without coordinates"""
+    from sqlalchemy import func
+
+    lat0, lon0 = math.radians(origin[0]), math.radians(origin[1])
+    lat, lon = func.radians(latitude_column), func.radians(longitude_column)
+    a = (func.power(func.sin((lat - lat0) / 2), 2) +
+         math.cos(lat0) * func.cos(lat) * func.power(func.sin((lon - lon0) / 2), 2))
+    return 2 * EARTH_RADIUS_MILES * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash of a point"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cover(origin: Point, radius_miles: float) -> Optional[List[str]]:
+    """Geohash prefixes whose cells together cover a circle around ``origin``.
+
+    Uses the longest prefixes for which at most MAX_COVER_CELLS cells span
+    the circle's bounding box. Returns None when even single-character cells
+    would need more, i.e. the circle covers a large part of the globe and a
+    prefix filter would not narrow anything down.
+    """
+    latitude, longitude = origin
+    lat_delta = math.degrees(radius_miles / EARTH_RADIUS_MILES)
+    min_lat, max_lat = max(-90.0, latitude - lat_delta), min(90.0, latitude + lat_delta)
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    lon_delta = math.degrees(radius_miles / (EARTH_RADIUS_MILES * cos_lat)) if cos_lat > 1e-9 else 360.0
+    min_lon, max_lon = longitude - lon_delta, longitude + lon_delta
+    if min_lon < -180.0 or max_lon > 180.0:
+        # Wraps around the antimeridian; span every longitude instead
+        min_lon, max_lon = -180.0, 180.0
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lon_bits = (5 * precision + 1) // 2
+        lat_bits = 5 * precision // 2
+        cell_height, cell_width = 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+        def cell_range(low, high, origin_value, size, bit_count):
+            last = (1 << bit_count) - 1
+            return min(int((low - origin_value) // size), last), min(int((high - origin_value) // size), last)
+
+        first_row, last_row = cell_range(min_lat, max_lat, -90.0, cell_height, lat_bits)
+        first_col, last_col = cell_range(min_lon, max_lon, -180.0, cell_width, lon_bits)
+        if (last_row - first_row + 1) * (last_col - first_col + 1) > MAX_COVER_CELLS:
+            continue
+        return [
+            geohash_encode(-90.0 + (row + 0.5) * cell_height, -180.0 + (col + 0.5) * cell_width, precision)
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        ]
+    return None
+
+
+# Shared gazetteer used to geocode candidate and job locations on write
+gazetteer = Gazetteer()
@@ -1,45 +1,85 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from models import CandidateProfile, JobPosting, WorkExperience, Education, SavedSearch
 from db import db
-from sqlalchemy import and_, or_, func
+from services.cursors import decode_cursor, encode_cursor, keyset_cursor, keyset_filter
+from services.gazetteer import distance_miles, distance_miles_expr, gazetteer, geohash_cover, geohash_encode
+from services.search_metrics import phase, record, search_metrics
+from services.search_cache import MatchScoreEntry, MatchScoreMemo, RankedResults, match_score_memo, search_result_cache
+from services.text_embeddings import candidate_embedding_index
+from services.skill_taxonomy import skill_taxonomy
+from services.vector_scoring import CandidateScoringEngine
+from sqlalchemy import and_, or_, false, func, event, inspect, select, union
+from sqlalchemy.orm import aliased
 from datetime import datetime
+import heapq
 import re
 import time
 
 class HiringMatchingService:
     """Service for candidate matching and search functionality"""
 
+    # Highest skill score reachable through preferred skills alone
+    MAX_PREFERRED_BONUS = 20
+
+    EXPERIENCE_LEVELS = {
+        'entry': 1,
+        'mid': 2,
+        'senior': 3,
+        'lead': 4,
+        'principal': 5,
+        'executive': 6
+    }
+
+    AVAILABILITY_SCORES = {
+        'actively_looking': 100,
+        'open_to_opportunities': 75,
+        'not_looking': 30
+    }
+
+    # Weighted overall score
+    MATCH_WEIGHTS = {
+        'skills': 0.4,
+        'experience': 0.3,
+        'location': 0.2,
+        'availability': 0.1
+    }
+
+    # Candidates loaded per round trip when streaming search results
+    STREAM_BATCH_SIZE = 50
+
+    # Pages ranked beyond the requested one on a cache miss, so the next pages are cache hits
+    RANKING_PREFETCH_PAGES = 4
+
+    # ai_ranking scores from which the text similarity is described as strong or moderate
+    AI_RANKING_STRONG_SCORE = 50
+    AI_RANKING_MODERATE_SCORE = 25
+
+    # Text search configuration of the generated search_vector columns
+    TEXT_SEARCH_CONFIG = 'english'
+
+    # Fixed USD value of one unit of each currency, for comparing salary ranges
+    USD_EXCHANGE_RATES = {
+        'USD': 1.0,
+        'EUR': 1.08,
+        'GBP': 1.27,
+        'CAD': 0.73,
+        'AUD': 0.66,
+        'CHF': 1.13,
+        'SEK': 0.095,
+        'INR': 0.012,
+        'JPY': 0.0067
+    }
+
     @staticmethod
     def normalize_skill(skill: str) -> str:
         """Normalize skill name for matching"""
-        # Convert to lowercase and remove extra spaces
-        normalized = skill.lower().strip()
-
-        # Handle common variations
-        variations = {
-            'react': ['reactjs', 'react.js'],
-            'javascript': ['js', 'javascript', 'java script'],
-            'typescript': ['ts', 'typescript'],
-            'node': ['nodejs', 'node.js'],
-            'python': ['python3', 'py'],
-            'css': ['css3'],
-            'html': ['html5'],
-            'postgresql': ['postgres', 'psql'],
-            'mongodb': ['mongo'],
-            'aws': ['amazon web services'],
-            'gcp': ['google cloud platform'],
-            'kubernetes': ['k8s'],
-            'docker': ['containerization'],
-            'machine learning': ['ml', 'machinelearning'],
-            'artificial intelligence': ['ai']
-        }
+        # Lowercase, strip and resolve aliases through the skill taxonomy
+        return skill_taxonomy.normalize(skill)
 
-        # Check if the skill matches any variation
-        for standard, variants in variations.items():
-            if normalized in variants or normalized == standard:
-                return standard
-
-        return normalized
+    @staticmethod
+    def normalize_skills(skills: Optional[List[str]]) -> List[str]:
+        """Normalize a list of skills, dropping duplicates but keeping order"""
+        return list(dict.fromkeys(HiringMatchingService.normalize_skill(skill) for skill in (skills or [])))
 
     @staticmethod
     def calculate_skill_match(candidate_skills: List[str], required_skills: List[str],
@@ -72,10 +112,9 @@ class HiringMatchingService:
                 matched_preferred.append(pref_skill)
 
         # Calculate score
-        required_match_rate = len(matched_required) / len(normalized_required) if normalized_required else 0
-        preferred_bonus = min(len(matched_preferred) * 0.05, 0.2)  # Max 20% bonus for preferred skills
-
-        score = min((required_match_rate + preferred_bonus) * 100, 100)
+        score = HiringMatchingService.skill_score_from_counts(
+            len(matched_required), len(normalized_required), len(matched_preferred)
+        )
 
         return {
             'score': score,
@@ -85,17 +124,32 @@ class HiringMatchingService:
             'total_required': len(normalized_required)
         }
 
+    @staticmethod
+    def skill_score_from_counts(matched_required: int, total_required: int, matched_preferred: int) -> float:
+        """Calculate skill score from matched skill counts"""
+        required_match_rate = matched_required / total_required if total_required else 0
+        preferred_bonus = min(matched_preferred * 0.05, 0.2)  # Max 20% bonus for preferred skills
+
+        return min((required_match_rate + preferred_bonus) * 100, 100)
+
+    @staticmethod
+    def weighted_match_score(skills_score: float, experience_score: float, location_score: float,
+                             availability_score: float) -> float:
+        """Combine component scores into the rounded overall match score"""
+        weights = HiringMatchingService.MATCH_WEIGHTS
+
+        overall_score = (
+            skills_score * weights['skills'] +
+            experience_score * weights['experience'] +
+            location_score * weights['location'] +
+            availability_score * weights['availability']
+        )
+        return round(overall_score, 2)
+
     @staticmethod
     def calculate_experience_match(candidate_level: str, required_level: str) -> Dict[str, Any]:
         """Calculate experience level match score"""
-        level_hierarchy = {
-            'entry': 1,
-            'mid': 2,
-            'senior': 3,
-            'lead': 4,
-            'principal': 5,
-            'executive': 6
-        }
+        level_hierarchy = HiringMatchingService.EXPERIENCE_LEVELS
 
         candidate_rank = level_hierarchy.get(candidate_level, 0)
         required_rank = level_hierarchy.get(required_level, 0)
@@ -133,17 +187,21 @@ class HiringMatchingService:
 
     @staticmethod
     def calculate_location_match(candidate_location: str, job_location: str,
-                               is_remote: bool = False) -> Dict[str, Any]:
-        """Calculate location match score"""
+                               is_remote: bool = False, distance: Optional[float] = None) -> Dict[str, Any]:
+        """Calculate location match score.
+
+        ``distance`` is the geocoded distance in miles, when both locations
+        are known to the gazetteer; it is reported but does not change the score.
+        """
         if is_remote:
-            return {'score': 100, 'distance': None}
+            return {'score': 100, 'distance': distance}
 
-        # Simple city/state matching (can be enhanced with geolocation)
-        candidate_clean = candidate_location.lower().strip()
-        job_clean = job_location.lower().strip()
+        # Simple city/state matching
+        candidate_clean = (candidate_location or '').lower().strip()
+        job_clean = (job_location or '').lower().strip()
 
         if candidate_clean == job_clean:
-            return {'score': 100, 'distance': 0}
+            return {'score': 100, 'distance': distance if distance is not None else 0}
 
         # Check if same city (different state format)
         candidate_parts = candidate_clean.split(',')
@@ -151,31 +209,74 @@ class HiringMatchingService:
 
         if len(candidate_parts) >= 2 and len(job_parts) >= 2:
             if candidate_parts[0].strip() == job_parts[0].strip():
-                return {'score': 90, 'distance': None}
+                return {'score': 90, 'distance': distance}
 
         # Check if same state/region
         if len(candidate_parts) >= 2 and len(job_parts) >= 2:
             if candidate_parts[-1].strip() == job_parts[-1].strip():
-                return {'score': 70, 'distance': None}
+                return {'score': 70, 'distance': distance}
 
         # Default to moderate score for different locations
-        return {'score': 40, 'distance': None}
+        return {'score': 40, 'distance': distance}
+
+    @staticmethod
+    def geocode_location(location: Optional[str]) -> Dict[str, Any]:
+        """Coordinate columns for a raw location, all None when the gazetteer doesn't know it"""
+        point = gazetteer.resolve(location)
+        if point is None:
+            return {'latitude': None, 'longitude': None, 'geohash': None}
+        return {'latitude': point[0], 'longitude': point[1], 'geohash': geohash_encode(*point)}
+
+    @staticmethod
+    def candidate_distance(candidate, location: Optional[str]) -> Optional[float]:
+        """Miles between a geocoded candidate and a raw location, or None if either is unknown"""
+        point = gazetteer.resolve(location)
+        if point is None or candidate.latitude is None or candidate.longitude is None:
+            return None
+        return round(distance_miles(point, (candidate.latitude, candidate.longitude)), 1)
 
     @staticmethod
     def calculate_availability_match(candidate_availability: str) -> Dict[str, Any]:
         """Calculate availability match score"""
-        availability_scores = {
-            'actively_looking': 100,
-            'open_to_opportunities': 75,
-            'not_looking': 30
-        }
-
-        score = availability_scores.get(candidate_availability, 50)
+        score = HiringMatchingService.AVAILABILITY_SCORES.get(candidate_availability, 50)
         return {'score': score, 'status': candidate_availability}
 
     @staticmethod
     def calculate_overall_match(candidate: CandidateProfile, job_requirements: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate overall match score for a candidate"""
+        """Calculate overall match score for a candidate, memoized per (candidate version, requirements)"""
+        memo_key = HiringMatchingService.score_memo_key(candidate, job_requirements)
+        if memo_key is not None:
+            memo_entry = match_score_memo.get(memo_key)
+            if memo_entry is not None and memo_entry.match_result is not None:
+                return HiringMatchingService._copy_match_result(memo_entry.match_result)
+
+        match_result = HiringMatchingService._compute_overall_match(candidate, job_requirements)
+        if memo_key is not None:
+            match_score_memo.put(memo_key, MatchScoreEntry(
+                match_result['match_score'], match_result['match_breakdown']['skills_match']['score'], match_result
+            ))
+            return HiringMatchingService._copy_match_result(match_result)
+        return match_result
+
+    @staticmethod
+    def score_memo_key(candidate, job_requirements: Dict[str, Any]) -> Optional[tuple]:
+        """Score memo key of a candidate row or instance, or None when it has no stable version"""
+        updated_at = getattr(candidate, 'updated_at', None)
+        if updated_at is None or not match_score_memo.enabled:
+            return None
+        state = inspect(candidate, raiseerr=False)
+        if state is not None and state.modified:
+            # Unflushed edits aren't reflected in updated_at yet
+            return None
+        return (candidate.id, updated_at, MatchScoreMemo.requirements_key(job_requirements))
+
+    @staticmethod
+    def _copy_match_result(match_result: Dict[str, Any]) -> Dict[str, Any]:
+        # Callers add keys such as ai_ranking to the breakdown; keep the memoized one intact
+        return {'match_score': match_result['match_score'], 'match_breakdown': dict(match_result['match_breakdown'])}
+
+    @staticmethod
+    def _compute_overall_match(candidate: CandidateProfile, job_requirements: Dict[str, Any]) -> Dict[str, Any]:
         # Extract job requirements
         required_skills = job_requirements.get('required_skills', [])
         preferred_skills = job_requirements.get('preferred_skills', [])
@@ -191,29 +292,20 @@ class HiringMatchingService:
             candidate.experience_level, experience_level
         )
         location_match = HiringMatchingService.calculate_location_match(
-            candidate.location, location, is_remote
+            candidate.location, location, is_remote,
+            HiringMatchingService.candidate_distance(candidate, location)
         )
         availability_match = HiringMatchingService.calculate_availability_match(
             candidate.availability
         )
 
         # Weighted overall score
-        weights = {
-            'skills': 0.4,
-            'experience': 0.3,
-            'location': 0.2,
-            'availability': 0.1
-        }
-
-        overall_score = (
-            skills_match['score'] * weights['skills'] +
-            experience_match['score'] * weights['experience'] +
-            location_match['score'] * weights['location'] +
-            availability_match['score'] * weights['availability']
+        overall_score = HiringMatchingService.weighted_match_score(
+            skills_match['score'], experience_match['score'], location_match['score'], availability_match['score']
         )
 
         return {
-            'match_score': round(overall_score, 2),
+            'match_score': overall_score,
             'match_breakdown': {
                 'skills_match': skills_match,
                 'experience_match': experience_match,
@@ -223,83 +315,305 @@ class HiringMatchingService:
         }
 
     @staticmethod
-    def search_candidates(search_request: Dict[str, Any]) -> Dict[str, Any]:
-        """Search and rank candidates based on job requirements"""
-        start_time = time.time()
+    def get_prefilter_skills(job_requirements: Dict[str, Any], skill_match_threshold: float) -> Optional[Set[str]]:
+        """Get normalized skills a candidate must share to reach the skill threshold, or None to scan everyone"""
+        if skill_match_threshold <= 0:
+            return None
 
-        # Extract search parameters
-        job_requirements = search_request.get('job_requirements', {})
-        filters = search_request.get('filters', {})
-        matching_criteria = search_request.get('matching', {})
-        pagination = search_request.get('pagination', {'page': 1, 'limit': 20})
-        sort_config = search_request.get('sort', {'field': 'match_score', 'order': 'desc'})
+        required_skills = job_requirements.get('required_skills') or []
+        preferred_skills = job_requirements.get('preferred_skills') or []
 
-        # Build base query
-        query = db.session.query(CandidateProfile)
+        # Without a matched required skill the skill score is at most the preferred bonus
+        skills = list(required_skills)
+        if skill_match_threshold <= HiringMatchingService.MAX_PREFERRED_BONUS:
+            skills.extend(preferred_skills)
 
-        # Apply filters
-        if filters:
-            if 'availability' in filters and filters['availability']:
-                query = query.filter(CandidateProfile.availability.in_(filters['availability']))
+        return {HiringMatchingService.normalize_skill(skill) for skill in skills}
 
-            if 'work_auth_status' in filters and filters['work_auth_status']:
-                query = query.filter(CandidateProfile.work_auth_status.in_(filters['work_auth_status']))
+    @staticmethod
+    def search_prefilter_skills(search_request: Dict[str, Any]) -> Optional[List[str]]:
+        """Sorted prefilter skills of a whole search request, or None when any candidate may qualify"""
+        matching_criteria = search_request.get('matching') or {}
+        prefilter_skills = HiringMatchingService.get_prefilter_skills(
+            search_request.get('job_requirements') or {}, matching_criteria.get('skill_match_threshold', 70)
+        )
+        return sorted(prefilter_skills) if prefilter_skills is not None else None
 
-            if 'location' in filters and filters['location']:
-                query = query.filter(CandidateProfile.location.ilike(f"%{filters['location']}%"))
+    @staticmethod
+    def get_recent_experience(candidate_ids: List[str], limit: int = 3) -> Dict[str, List[WorkExperience]]:
+        """Get the most recent work experience for many candidates in one query"""
+        if not candidate_ids:
+            return {}
+
+        # Rank each candidate's experience by start date and keep the top rows
+        ranked = db.session.query(
+            WorkExperience,
+            func.row_number().over(
+                partition_by=WorkExperience.candidate_id,
+                order_by=WorkExperience.start_date.desc()
+            ).label('row_number')
+        ).filter(WorkExperience.candidate_id.in_(candidate_ids)).subquery()
+
+        ranked_experience = aliased(WorkExperience, ranked)
+        rows = db.session.query(ranked_experience).filter(
+            ranked.c.row_number <= limit
+        ).order_by(ranked.c.candidate_id, ranked.c.row_number).all()
+
+        result: Dict[str, List[WorkExperience]] = {}
+        for experience in rows:
+            result.setdefault(experience.candidate_id, []).append(experience)
+        return result
 
-            if 'salary_range' in filters and filters['salary_range']:
-                salary_filter = filters['salary_range']
-                # This would need more complex JSON query logic for salary expectations
-                pass
+    @staticmethod
+    def apply_skill_prefilter(query, job_requirements: Dict[str, Any], skill_match_threshold: float):
+        """Restrict a candidate query to candidates that can reach the skill threshold (GIN-indexed overlap)"""
+        prefilter_skills = HiringMatchingService.get_prefilter_skills(job_requirements, skill_match_threshold)
+        if prefilter_skills is None:
+            return query
+        return query.filter(CandidateProfile.normalized_skills.overlap(sorted(prefilter_skills)))
 
-        # Get all candidates (for now, we'll do matching in Python)
-        all_candidates = query.all()
+    @staticmethod
+    def renormalize_persisted_skills(batch_size: int = 1000) -> int:
+        """Recompute stored normalized_skills after the skill taxonomy changes"""
+        updated = 0
+        persisted = (
+            (CandidateProfile, 'skills', 'normalized_skills'),
+            (WorkExperience, 'skills', 'normalized_skills'),
+            (JobPosting, 'required_skills', 'normalized_required_skills'),
+        )
+        for model, source, target in persisted:
+            changes = []
+            rows = db.session.query(model.id, getattr(model, source), getattr(model, target)).yield_per(batch_size)
+            for row_id, skills, normalized_skills in rows:
+                normalized = HiringMatchingService.normalize_skills(skills)
+                if normalized != list(normalized_skills or []):
+                    changes.append({'id': row_id, target: normalized})
+
+            for start in range(0, len(changes), batch_size):
+                db.session.execute(db.update(model), changes[start:start + batch_size])
+            updated += len(changes)
+
+        # Saved search prefilters are normalized from the skills in their criteria
+        changes = []
+        rows = db.session.query(SavedSearch.id, SavedSearch.search_criteria, SavedSearch.prefilter_skills).yield_per(batch_size)
+        for row_id, search_criteria, prefilter_skills in rows:
+            normalized = HiringMatchingService.search_prefilter_skills(search_criteria or {})
+            if normalized != (list(prefilter_skills) if prefilter_skills is not None else None):
+                changes.append({'id': row_id, 'prefilter_skills': normalized})
+        for start in range(0, len(changes), batch_size):
+            db.session.execute(db.update(SavedSearch), changes[start:start + batch_size])
+        updated += len(changes)
+
+        db.session.commit()
+        return updated
 
-        # Calculate match scores
-        candidates_with_scores = []
-        min_match_score = matching_criteria.get('min_match_score', 60)
-        skill_match_threshold = matching_criteria.get('skill_match_threshold', 70)
+    @staticmethod
+    def saved_searches_reachable_by_any(skills: Set[str]):
+        """Criterion for saved searches a candidate with one of the normalized ``skills`` may qualify for (GIN-indexed)"""
+        return or_(SavedSearch.prefilter_skills.is_(None), SavedSearch.prefilter_skills.overlap(sorted(skills)))
 
-        for candidate in all_candidates:
-            match_result = HiringMatchingService.calculate_overall_match(candidate, job_requirements)
+    @staticmethod
+    def active_jobs_requiring_any(skills: Set[str]):
+        """Criterion for active jobs requiring at least one of the normalized ``skills`` (GIN-indexed)"""
+        return and_(JobPosting.status == 'active', JobPosting.normalized_required_skills.overlap(sorted(skills)))
 
-            # Check if meets minimum thresholds
-            if (match_result['match_score'] >= min_match_score and
-                match_result['match_breakdown']['skills_match']['score'] >= skill_match_threshold):
+    @staticmethod
+    def keyword_query(keywords: str):
+        """tsquery for web-search style keywords: quoted phrases, OR and -exclusions"""
+        return func.websearch_to_tsquery(HiringMatchingService.TEXT_SEARCH_CONFIG, keywords)
 
-                # Get recent work experience
-                recent_experience = candidate.work_experience.order_by(WorkExperience.start_date.desc()).limit(3).all()
+    @staticmethod
+    def keyword_match(keywords: str):
+        """Criterion for candidates whose profile or any work experience matches ``keywords``.
+
+        Matching ids are collected from both GIN-indexed search vectors, so
+        neither table is scanned.
+        """
+        tsquery = HiringMatchingService.keyword_query(keywords)
+        profile = aliased(CandidateProfile)
+        matching_ids = union(
+            select(profile.id).where(profile.search_vector.op('@@')(tsquery)),
+            select(WorkExperience.candidate_id).where(WorkExperience.search_vector.op('@@')(tsquery))
+        )
+        return CandidateProfile.id.in_(matching_ids)
+
+    @staticmethod
+    def keyword_relevance(keywords: str):
+        """ts_rank of a candidate's profile plus its best-ranked matching work experience"""
+        tsquery = HiringMatchingService.keyword_query(keywords)
+        experience_rank = (
+            select(func.max(func.ts_rank(WorkExperience.search_vector, tsquery)))
+            .where(WorkExperience.candidate_id == CandidateProfile.id,
+                   WorkExperience.search_vector.op('@@')(tsquery))
+            .scalar_subquery()
+        )
+        return func.ts_rank(CandidateProfile.search_vector, tsquery) + func.coalesce(experience_rank, 0)
 
-                candidates_with_scores.append({
-                    'candidate': candidate,
+    @staticmethod
+    def match_jobs_for_candidate(candidate: CandidateProfile, page: int = 1, limit: int = 20,
+                                 min_match_score: float = 60, skill_match_threshold: float = 70,
+                                 max_distance: Optional[float] = None) -> Dict[str, Any]:
+        """Rank active job postings for a candidate.
+
+        Only jobs sharing a required skill with the candidate are looked up,
+        through the skill index on active jobs, so the cost follows the
+        candidate's skills rather than the number of postings. With a skill
+        threshold at or below the preferred-skill bonus every active job is
+        scored instead. ``max_distance`` keeps remote jobs and jobs geocoded
+        within that many miles of the candidate.
+        """
+        query = db.session.query(JobPosting)
+        if skill_match_threshold > HiringMatchingService.MAX_PREFERRED_BONUS:
+            query = query.filter(HiringMatchingService.active_jobs_requiring_any(set(candidate.normalized_skills or ())))
+        else:
+            query = query.filter(JobPosting.status == 'active')
+
+        if max_distance is not None:
+            if candidate.latitude is None or candidate.longitude is None:
+                query = query.filter(JobPosting.is_remote.is_(True))
+            else:
+                query = query.filter(or_(
+                    JobPosting.is_remote.is_(True),
+                    distance_miles_expr(JobPosting.latitude, JobPosting.longitude,
+                                        (candidate.latitude, candidate.longitude)) <= max_distance
+                ))
+
+        matches = []
+        for job in query:
+            match_result = HiringMatchingService.calculate_overall_match(candidate, {
+                'required_skills': job.required_skills or [],
+                'preferred_skills': job.preferred_skills or [],
+                'experience_level': job.experience_level,
+                'location': job.location,
+                'is_remote': bool(job.is_remote)
+            })
+            if (match_result['match_breakdown']['skills_match']['score'] >= skill_match_threshold and
+                    match_result['match_score'] >= min_match_score):
+                matches.append({
+                    'job': job,
                     'match_score': match_result['match_score'],
-                    'match_breakdown': match_result['match_breakdown'],
-                    'recent_experience': recent_experience
+                    'match_breakdown': match_result['match_breakdown']
                 })
 
-        # Sort candidates
-        reverse = sort_config.get('order', 'desc') == 'desc'
-
-        if sort_config.get('field') == 'match_score':
-            candidates_with_scores.sort(key=lambda x: x['match_score'], reverse=reverse)
-        elif sort_config.get('field') == 'name':
-            candidates_with_scores.sort(key=lambda x: x['candidate'].name, reverse=reverse)
-        elif sort_config.get('field') == 'experience':
-            level_order = {'entry': 1, 'mid': 2, 'senior': 3, 'lead': 4, 'principal': 5, 'executive': 6}
-            candidates_with_scores.sort(
-                key=lambda x: level_order.get(x['candidate'].experience_level, 0),
-                reverse=reverse
-            )
+        # Best matches first, newest posting on ties
+        matches.sort(key=lambda x: (x['match_score'], x['job'].posted_at or datetime.min), reverse=True)
+
+        total = len(matches)
+        start_idx = (page - 1) * limit
+        return {
+            'jobs': matches[start_idx:start_idx + limit],
+            'pagination': {
+                'page': page,
+                'limit': limit,
+                'total': total,
+                'total_pages': (total + limit - 1) // limit,
+                'has_next': page * limit < total,
+                'has_prev': page > 1
+            }
+        }
+
+    @staticmethod
+    def search_candidates(search_request: Dict[str, Any], stream: bool = False, debug: bool = False) -> Dict[str, Any]:
+        """Search and rank candidates based on job requirements.
+
+        With ``stream`` the page candidates are returned as a generator that
+        loads and scores them in batches of ``STREAM_BATCH_SIZE``, so callers
+        can start sending results before the whole page is built; the page
+        phases are then not part of the timings.
+
+        Every search is profiled per phase and reported to the search metrics
+        sinks. With ``debug`` the profile is also returned as
+        ``search_metadata['timings']``.
+        """
+        with search_metrics.profile() as profile:
+            search_result = HiringMatchingService._search_candidates(search_request, stream)
+
+        search_metadata = search_result['search_metadata']
+        search_metrics.emit(profile, {
+            'search_time': search_metadata['search_time'],
+            'scoring_mode': (search_request.get('matching') or {}).get('scoring_mode'),
+            'cache_hit': search_metadata['cache_hit'],
+            'total_matches': search_metadata['total_matches']
+        })
+        if debug:
+            search_metadata['timings'] = profile.to_dict()
+        return search_result
+
+    @staticmethod
+    def _search_candidates(search_request: Dict[str, Any], stream: bool) -> Dict[str, Any]:
+        start_time = time.time()
+
+        # Extract search parameters
+        job_requirements = search_request.get('job_requirements') or {}
+        filters = search_request.get('filters') or {}
+        matching_criteria = search_request.get('matching') or {}
+        pagination = search_request.get('pagination') or {'page': 1, 'limit': 20}
 
-        # Pagination
         page = pagination.get('page', 1)
         limit = pagination.get('limit', 20)
-        total = len(candidates_with_scores)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
+        cursor = pagination.get('cursor')
+        use_ai_ranking = matching_criteria.get('use_ai_ranking', True)
+
+        HiringMatchingService.validate_search_filters(search_request)
+
+        def rank(top_k: int) -> RankedResults:
+            ranked = HiringMatchingService.rank_search(search_request, top_k)
+            record('candidates_qualified', ranked.total)
+            return ranked
+
+        cache_key = search_result_cache.key_for(search_request)
+        cache_version = search_result_cache.version
+
+        def snapshot_length(served: int) -> int:
+            # Snapshots pin the served candidates plus the prefetched pages, not the whole ranking
+            return served + (HiringMatchingService.RANKING_PREFETCH_PAGES + 1) * limit
+
+        snapshot_id = None
+        if cursor:
+            # Continue a pinned ranking so pages stay stable while candidates change
+            snapshot_id, start_idx = HiringMatchingService.decode_search_cursor(cursor)
+            ranked = search_result_cache.get_snapshot(snapshot_id, cache_key)
+            if ranked is None:
+                raise ValueError('Search cursor has expired or does not belong to this search')
+            page = start_idx // limit + 1
+            cache_hit = ranked.covers(start_idx + limit)
+            if not cache_hit:
+                # Everything pinned so far may have been served to a client sharing the snapshot
+                pinned = len(ranked.candidate_ids)
+                fresh = rank(snapshot_length(pinned))
+                ranked = HiringMatchingService.extend_ranking(ranked, pinned, fresh)
+                search_result_cache.update_snapshot(snapshot_id, cache_key, ranked, snapshot_length(start_idx))
+        else:
+            # Every page of a search is a slice of one ranking, cached across requests
+            start_idx = (page - 1) * limit
+            ranked = search_result_cache.get(cache_key)
+            cache_hit = ranked is not None and ranked.covers(page * limit)
+            if not cache_hit:
+                ranked = rank((page + HiringMatchingService.RANKING_PREFETCH_PAGES) * limit)
+                search_result_cache.put(cache_key, ranked, version=cache_version)
 
-        paginated_candidates = candidates_with_scores[start_idx:end_idx]
+        # Pagination
+        with phase('pagination'):
+            total = ranked.total
+            end_idx = start_idx + limit
+            page_ids = ranked.candidate_ids[start_idx:end_idx]
+
+            next_cursor = None
+            if end_idx < total:
+                if snapshot_id is None:
+                    snapshot_id = search_result_cache.save_snapshot(cache_key, ranked, snapshot_length(start_idx),
+                                                                    version=cache_version)
+                if snapshot_id is not None:
+                    next_cursor = encode_cursor({'snapshot': snapshot_id, 'offset': end_idx})
+
+        if stream:
+            paginated_candidates = HiringMatchingService._iter_page(
+                page_ids, job_requirements, HiringMatchingService.STREAM_BATCH_SIZE, use_ai_ranking
+            )
+        else:
+            paginated_candidates = list(HiringMatchingService._iter_page(
+                page_ids, job_requirements, use_ai_ranking=use_ai_ranking
+            ))
 
         # Calculate search time
         search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -311,79 +625,689 @@ class HiringMatchingService:
                 'limit': limit,
                 'total': total,
                 'total_pages': (total + limit - 1) // limit,
-                'has_next': page * limit < total,
-                'has_prev': page > 1
+                'has_next': end_idx < total,
+                'has_prev': start_idx > 0,
+                'next_cursor': next_cursor
             },
             'search_metadata': {
                 'total_matches': total,
                 'search_time': search_time,
+                'cache_hit': cache_hit,
                 'applied_filters': filters,
                 'matching_criteria': matching_criteria
             }
         }
 
     @staticmethod
-    def get_candidates_list(page: int = 1, limit: int = 20, sort: str = 'name',
-                          order: str = 'asc') -> Dict[str, Any]:
-        """Get paginated list of all candidates"""
-        # Build query
-        query = db.session.query(CandidateProfile)
+    def salary_range_usd(salary: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float]]:
+        """(min, max) of a salary range in USD; a missing bound takes the other, unknown currencies give (None, None)"""
+        if not salary:
+            return None, None
+        rate = HiringMatchingService.USD_EXCHANGE_RATES.get((salary.get('currency') or 'USD').upper())
+        low, high = salary.get('min'), salary.get('max')
+        if rate is None or (low is None and high is None):
+            return None, None
+        low = high if low is None else low
+        high = low if high is None else high
+        return float(low) * rate, float(high) * rate
 
-        # Apply sorting
-        if sort == 'name':
-            query = query.order_by(CandidateProfile.name.asc() if order == 'asc' else CandidateProfile.name.desc())
-        elif sort == 'experience':
-            level_order = {'entry': 1, 'mid': 2, 'senior': 3, 'lead': 4, 'principal': 5, 'executive': 6}
-            # This would need a custom sort in Python or a SQL CASE statement
-            query = query.order_by(CandidateProfile.experience_level)
-        elif sort == 'location':
-            query = query.order_by(CandidateProfile.location.asc() if order == 'asc' else CandidateProfile.location.desc())
-        elif sort == 'created_at':
-            query = query.order_by(CandidateProfile.created_at.asc() if order == 'asc' else CandidateProfile.created_at.desc())
+    @staticmethod
+    def distance_origin(filters: Dict[str, Any], job_requirements: Optional[Dict[str, Any]]):
+        """Point max_distance is measured from: the filter location, else the job location"""
+        return gazetteer.resolve(filters.get('location') or (job_requirements or {}).get('location'))
 
-        # Get total count
-        total = query.count()
+    @staticmethod
+    def validate_search_filters(search_request: Dict[str, Any]):
+        """Raise ValueError for filters that cannot be applied"""
+        filters = search_request.get('filters') or {}
+        if filters.get('max_distance') is not None and \
+                HiringMatchingService.distance_origin(filters, search_request.get('job_requirements')) is None:
+            raise ValueError('maxDistance requires a filter or job location known to the gazetteer')
+        if filters.get('salary_range') and \
+                HiringMatchingService.salary_range_usd(filters['salary_range']) == (None, None):
+            raise ValueError(f"Unsupported salary currency: {filters['salary_range'].get('currency')}")
+        sort_config = search_request.get('sort') or {}
+        if sort_config.get('field') == 'relevance' and not filters.get('keywords'):
+            raise ValueError('Sorting by relevance requires keywords')
 
-        # Apply pagination
-        candidates = query.offset((page - 1) * limit).limit(limit).all()
+    @staticmethod
+    def apply_search_filters(query, filters: Optional[Dict[str, Any]],
+                             job_requirements: Optional[Dict[str, Any]] = None):
+        """Apply search request filters to a candidate query.
+
+        ``max_distance`` keeps candidates geocoded within that many miles of
+        the filter location (else the job location): a geohash prefix lookup
+        narrows the scan before the exact distance check. Without it,
+        ``location`` is a substring match on the candidate's location; when
+        the gazetteer knows it, candidates geocoded to the same place match
+        too, whatever their location text.
+        ``salary_range`` keeps candidates whose expected salary range overlaps
+        it, compared in USD, and candidates without salary expectations.
+        ``keywords`` is a full-text query over bios and work experience.
+        """
+        if filters:
+            if filters.get('keywords'):
+                query = query.filter(HiringMatchingService.keyword_match(filters['keywords']))
 
-        return {
-            'candidates': candidates,
-            'pagination': {
-                'page': page,
-                'limit': limit,
-                'total': total,
-                'total_pages': (total + limit - 1) // limit,
-                'has_next': page * limit < total,
-                'has_prev': page > 1
+            if 'availability' in filters and filters['availability']:
+                query = query.filter(CandidateProfile.availability.in_(filters['availability']))
+
+            if 'work_auth_status' in filters and filters['work_auth_status']:
+                query = query.filter(CandidateProfile.work_auth_status.in_(filters['work_auth_status']))
+
+            if filters.get('max_distance') is not None:
+                origin = HiringMatchingService.distance_origin(filters, job_requirements)
+                if origin is None:
+                    query = query.filter(false())
+                else:
+                    cover = geohash_cover(origin, filters['max_distance'])
+                    if cover is not None:
+                        query = query.filter(or_(*[CandidateProfile.geohash.startswith(prefix) for prefix in cover]))
+                    query = query.filter(distance_miles_expr(
+                        CandidateProfile.latitude, CandidateProfile.longitude, origin
+                    ) <= filters['max_distance'])
+            elif 'location' in filters and filters['location']:
+                place = gazetteer.resolve(filters['location'])
+                location_match = CandidateProfile.location.ilike(f"%{filters['location']}%")
+                if place is not None:
+                    location_match = or_(CandidateProfile.geohash == geohash_encode(*place), location_match)
+                query = query.filter(location_match)
+
+            if 'salary_range' in filters and filters['salary_range']:
+                budget_min, budget_max = HiringMatchingService.salary_range_usd(filters['salary_range'])
+                if budget_min is None:
+                    query = query.filter(false())
+                else:
+                    query = query.filter(or_(
+                        CandidateProfile.salary_min_usd.is_(None),
+                        and_(CandidateProfile.salary_min_usd <= budget_max, CandidateProfile.salary_max_usd >= budget_min)
+                    ))
+
+        return query
+
+    @staticmethod
+    def candidate_matches_filters(candidate, filters: Optional[Dict[str, Any]],
+                                  job_requirements: Optional[Dict[str, Any]] = None) -> bool:
+        """Python counterpart of apply_search_filters for a single candidate.
+
+        ``keywords`` needs PostgreSQL full-text search and is not checked here;
+        callers resolve it with keyword_match.
+        """
+        if not filters:
+            return True
+
+        if filters.get('availability') and candidate.availability not in filters['availability']:
+            return False
+
+        if filters.get('work_auth_status') and candidate.work_auth_status not in filters['work_auth_status']:
+            return False
+
+        if filters.get('max_distance') is not None:
+            origin = HiringMatchingService.distance_origin(filters, job_requirements)
+            if origin is None or candidate.latitude is None or candidate.longitude is None:
+                return False
+            if distance_miles(origin, (candidate.latitude, candidate.longitude)) > filters['max_distance']:
+                return False
+        elif filters.get('location'):
+            place = gazetteer.resolve(filters['location'])
+            same_place = place is not None and (candidate.latitude, candidate.longitude) == place
+            if not same_place and filters['location'].lower() not in (candidate.location or '').lower():
+                return False
+
+        if filters.get('salary_range'):
+            budget_min, budget_max = HiringMatchingService.salary_range_usd(filters['salary_range'])
+            if budget_min is None:
+                return False
+            if candidate.salary_min_usd is not None and \
+                    not (candidate.salary_min_usd <= budget_max and candidate.salary_max_usd >= budget_min):
+                return False
+
+        return True
+
+    @staticmethod
+    def rank_search(search_request: Dict[str, Any], top_k: Optional[int] = None,
+                    base_query=None) -> RankedResults:
+        """Rank the candidates matching a search request, keeping the first ``top_k`` (all when None).
+
+        ``base_query`` narrows the candidate pool before the search filters
+        apply; parallel scoring workers pass their shard's id range.
+        """
+        job_requirements = search_request.get('job_requirements') or {}
+        filters = search_request.get('filters') or {}
+        matching_criteria = search_request.get('matching') or {}
+        sort_config = search_request.get('sort') or {'field': 'match_score', 'order': 'desc'}
+        min_match_score = matching_criteria.get('min_match_score', 60)
+        skill_match_threshold = matching_criteria.get('skill_match_threshold', 70)
+
+        scoring_mode = matching_criteria.get('scoring_mode')
+        # Parallel ranking merges shards by match score; other sorts and single-core hosts rank in process
+        if scoring_mode == 'parallel' and base_query is None and sort_config.get('field', 'match_score') == 'match_score':
+            from services.parallel_scoring import parallel_scoring_executor
+            if parallel_scoring_executor.enabled:
+                with phase('scoring'):
+                    return parallel_scoring_executor.rank(search_request, top_k)
+
+        with phase('filter_query'):
+            # Build base query
+            if base_query is None:
+                base_query = db.session.query(CandidateProfile)
+            query = HiringMatchingService.apply_search_filters(base_query, filters, job_requirements)
+
+            relevance = None
+            if sort_config.get('field') == 'relevance' and filters.get('keywords'):
+                relevance = HiringMatchingService.keyword_relevance(filters['keywords'])
+
+        if scoring_mode == 'vectorized' and not candidate_scoring_engine.is_built:
+            # The pool loads on a background thread; rank in PostgreSQL until it is ready
+            candidate_scoring_engine.build_in_background()
+            scoring_mode = 'sql'
+
+        if scoring_mode == 'sql':
+            return HiringMatchingService._rank_candidates_sql(
+                query, job_requirements, min_match_score, skill_match_threshold, sort_config, top_k, relevance
+            )
+        if relevance is not None:
+            # Python and vectorized ranking sort by relevance through the query order
+            descending = sort_config.get('order', 'desc') == 'desc'
+            query = query.order_by(relevance.desc() if descending else relevance.asc(), CandidateProfile.id.asc())
+        if scoring_mode == 'vectorized':
+            return HiringMatchingService._rank_candidates_vectorized(
+                query if filters else None, job_requirements, min_match_score, skill_match_threshold, sort_config
+            )
+        return HiringMatchingService._rank_candidates_python(
+            query, job_requirements, min_match_score, skill_match_threshold, sort_config, top_k
+        )
+
+    @staticmethod
+    def score_candidate_for_search(candidate, search_request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Score one candidate against a search request.
+
+        Returns the calculate_overall_match result, or None when the candidate
+        fails the filters or the match thresholds.
+        """
+        matching_criteria = search_request.get('matching') or {}
+        if not HiringMatchingService.candidate_matches_filters(candidate, search_request.get('filters'),
+                                                               search_request.get('job_requirements')):
+            return None
+
+        match_result = HiringMatchingService.calculate_overall_match(
+            candidate, search_request.get('job_requirements') or {}
+        )
+        if match_result['match_breakdown']['skills_match']['score'] < matching_criteria.get('skill_match_threshold', 70):
+            return None
+        if match_result['match_score'] < matching_criteria.get('min_match_score', 60):
+            return None
+        return match_result
+
+    @staticmethod
+    def decode_search_cursor(cursor: str) -> Tuple[str, int]:
+        """Return the (snapshot id, offset) referenced by a search cursor"""
+        payload = decode_cursor(cursor)
+        snapshot_id, offset = payload.get('snapshot'), payload.get('offset')
+        if not isinstance(snapshot_id, str) or not isinstance(offset, int) or offset < 0:
+            raise ValueError('Invalid cursor')
+        return snapshot_id, offset
+
+    @staticmethod
+    def extend_ranking(ranked: RankedResults, served: int, fresh: RankedResults) -> RankedResults:
+        """Extend a partial pinned ranking with a fresh one.
+
+        The first ``served`` candidates keep their places; the rest continue
+        in fresh order, skipping candidates that were already served.
+        """
+        served_ids = set(ranked.candidate_ids[:served])
+        candidate_ids = list(ranked.candidate_ids[:served])
+        match_scores = list(ranked.match_scores[:served])
+        repeated = 0
+        for candidate_id, match_score in zip(fresh.candidate_ids, fresh.match_scores):
+            if candidate_id in served_ids:
+                repeated += 1
+                continue
+            candidate_ids.append(candidate_id)
+            match_scores.append(match_score)
+        return RankedResults(candidate_ids, match_scores, served + fresh.total - repeated)
+
+    @staticmethod
+    def _rank_candidates_python(query, job_requirements: Dict[str, Any], min_match_score: float,
+                                skill_match_threshold: float, sort_config: Dict[str, Any],
+                                top_k: Optional[int] = None) -> RankedResults:
+        """Score filtered candidates in Python and rank the first ``top_k`` (all when None).
+
+        Scores are computed from plain column tuples; full breakdown dicts are
+        built later for the returned page only. Scores of candidates unchanged
+        since an earlier search for the same requirements come from the score
+        memo. Otherwise each candidate's upper bound (its exact non-skill
+        components plus a perfect skill score) skips the skill comparison for
+        candidates that can't reach ``min_match_score``. When sorting by match
+        score, a bounded heap holds the best ``top_k`` candidates.
+        """
+        with phase('filter_query'):
+            query = HiringMatchingService.apply_skill_prefilter(query, job_requirements, skill_match_threshold)
+
+        with phase('row_fetch'):
+            rows = query.with_entities(
+                CandidateProfile.id,
+                CandidateProfile.name,
+                CandidateProfile.normalized_skills,
+                CandidateProfile.experience_level,
+                CandidateProfile.availability,
+                CandidateProfile.location,
+                CandidateProfile.updated_at
+            ).all()
+        record('candidates_scanned', len(rows))
+
+        # Job side, normalized once
+        with phase('normalization'):
+            required_skills = [HiringMatchingService.normalize_skill(skill)
+                               for skill in (job_requirements.get('required_skills') or [])]
+            preferred_skills = [HiringMatchingService.normalize_skill(skill)
+                                for skill in (job_requirements.get('preferred_skills') or [])]
+        experience_level = job_requirements.get('experience_level', '')
+        location = job_requirements.get('location', '')
+        is_remote = job_requirements.get('is_remote', False)
+
+        # Component scores that only depend on one candidate column, computed once per distinct value
+        experience_scores: Dict[str, float] = {}
+        location_scores: Dict[str, float] = {}
+        availability_scores: Dict[str, float] = {}
+
+        def skills_score_for(skills):
+            # Normalized on write, so only set lookups remain here
+            if not skills or not required_skills:
+                return 0
+            candidate_skills = set(skills)
+            return HiringMatchingService.skill_score_from_counts(
+                sum(1 for skill in required_skills if skill in candidate_skills),
+                len(required_skills),
+                sum(1 for skill in preferred_skills if skill in candidate_skills)
+            )
+
+        field = sort_config.get('field')
+        descending = sort_config.get('order', 'desc') == 'desc'
+        use_bounds = top_k is not None and field == 'match_score' and descending
+
+        total = 0
+        heap: List[Tuple[float, int, str]] = []  # (score, -position, id); heap[0] is the current k-th best
+        qualifying: List[Tuple[int, str, float, str, int]] = []  # (position, id, score, name, experience rank)
+
+        with phase('scoring'):
+            # Memoized scores of unchanged candidates against the same requirements
+            memo_keys: Optional[List[Optional[tuple]]] = None
+            memo_entries: List[Optional[MatchScoreEntry]] = []
+            memo_misses: List[tuple] = []
+            if match_score_memo.enabled:
+                requirements_key = MatchScoreMemo.requirements_key(job_requirements)
+                memo_keys = [(row[0], row[6], requirements_key) if row[6] is not None else None for row in rows]
+                memo_entries = match_score_memo.get_many(memo_keys)
+
+            for position, (candidate_id, name, skills, candidate_level, availability, candidate_location,
+                           updated_at) in enumerate(rows):
+                memo_entry = memo_entries[position] if memo_keys is not None else None
+                if memo_entry is not None:
+                    skills_score, match_score = memo_entry.skills_score, memo_entry.match_score
+                else:
+                    experience_score = experience_scores.get(candidate_level)
+                    if experience_score is None:
+                        experience_score = experience_scores[candidate_level] = HiringMatchingService.calculate_experience_match(
+                            candidate_level, experience_level)['score']
+                    location_score = location_scores.get(candidate_location)
+                    if location_score is None:
+                        location_score = location_scores[candidate_location] = HiringMatchingService.calculate_location_match(
+                            candidate_location, location, is_remote)['score']
+                    availability_score = availability_scores.get(availability)
+                    if availability_score is None:
+                        availability_score = availability_scores[availability] = HiringMatchingService.calculate_availability_match(
+                            availability)['score']
+
+                    # Best score reachable with a perfect skill match
+                    upper_bound = HiringMatchingService.weighted_match_score(100, experience_score, location_score, availability_score)
+                    if upper_bound < min_match_score:
+                        continue
+
+                    skills_score = skills_score_for(skills)
+                    match_score = HiringMatchingService.weighted_match_score(
+                        skills_score, experience_score, location_score, availability_score
+                    )
+                    if memo_keys is not None and memo_keys[position] is not None:
+                        memo_misses.append((memo_keys[position], MatchScoreEntry(match_score, skills_score)))
+
+                if skills_score < skill_match_threshold or match_score < min_match_score:
+                    continue
+                total += 1
+
+                if use_bounds:
+                    # Later candidates lose ties, as in a stable sort
+                    entry = (match_score, -position, candidate_id)
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+                else:
+                    qualifying.append((position, candidate_id, match_score, name,
+                                       HiringMatchingService.EXPERIENCE_LEVELS.get(candidate_level, 0)))
+
+            match_score_memo.put_many(memo_misses)
+
+        # Select the first top_k candidates in sort order
+        with phase('sort'):
+            if use_bounds:
+                top = sorted(heap, reverse=True)
+                return RankedResults([entry[2] for entry in top], [entry[0] for entry in top], total)
+
+            sort_keys = {
+                'match_score': lambda x: x[2],
+                'name': lambda x: x[3],
+                'experience': lambda x: x[4],
+                # Rows arrive in relevance order already
+                'relevance': (lambda x: -x[0]) if descending else (lambda x: x[0])
             }
+            sort_key = sort_keys.get(field)
+            if sort_key is None:
+                top = qualifying[:top_k]
+            elif top_k is None:
+                top = sorted(qualifying, key=sort_key, reverse=descending)
+            elif descending:
+                top = heapq.nlargest(top_k, qualifying, key=sort_key)
+            else:
+                top = heapq.nsmallest(top_k, qualifying, key=sort_key)
+            return RankedResults([item[1] for item in top], [item[2] for item in top], total)
+
+    @staticmethod
+    def _iter_page(page_ids: List[str], job_requirements: Dict[str, Any],
+                   batch_size: Optional[int] = None, use_ai_ranking: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield page candidates in order with their breakdown and recent experience.
+
+        Rows are loaded ``batch_size`` ids at a time (all at once when None)
+        and released from the session once the next batch is requested.
+        With ``use_ai_ranking`` each breakdown gets its ``ai_ranking``.
+        """
+        batch_size = batch_size or max(len(page_ids), 1)
+        for start in range(0, len(page_ids), batch_size):
+            with phase('page_build'):
+                batch = HiringMatchingService._build_page(page_ids[start:start + batch_size], job_requirements)
+
+            if use_ai_ranking:
+                with phase('ai_ranking'):
+                    ai_rankings = HiringMatchingService.ai_rankings([item['candidate'].id for item in batch], job_requirements)
+                for item in batch:
+                    item['match_breakdown']['ai_ranking'] = ai_rankings.get(item['candidate'].id)
+
+            # Get recent work experience for the returned page only
+            with phase('experience_fetch'):
+                recent_experience = HiringMatchingService.get_recent_experience(
+                    [item['candidate'].id for item in batch]
+                )
+            for item in batch:
+                item['recent_experience'] = recent_experience.get(item['candidate'].id, [])
+            yield from batch
+
+            if batch_size < len(page_ids):
+                # Keep memory flat across batches of a streamed page
+                for item in batch:
+                    for experience in item['recent_experience']:
+                        db.session.expunge(experience)
+                    db.session.expunge(item['candidate'])
+
+    @staticmethod
+    def ai_rankings(candidate_ids: List[str], job_requirements: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Text-similarity ai_ranking of candidates against a job, by candidate id.
+
+        Compares local embeddings of the job title, description and skills
+        with each candidate's bio, skills and work experience; the score is
+        the cosine similarity as a percentage, floored at 0.
+        """
+        query = candidate_embedding_index.embed(
+            [job_requirements.get('title'), job_requirements.get('job_description')],
+            HiringMatchingService.normalize_skills(
+                (job_requirements.get('required_skills') or []) + (job_requirements.get('preferred_skills') or [])
+            )
+        )
+        if not query.any():
+            return {}
+
+        rankings = {}
+        for candidate_id, similarity in candidate_embedding_index.similarities(query, candidate_ids).items():
+            score = round(max(similarity, 0.0) * 100, 2)
+            if score >= HiringMatchingService.AI_RANKING_STRONG_SCORE:
+                reasoning = 'Profile and experience closely resemble the job description and skills'
+            elif score >= HiringMatchingService.AI_RANKING_MODERATE_SCORE:
+                reasoning = 'Profile and experience partly resemble the job description and skills'
+            else:
+                reasoning = 'Profile and experience have little in common with the job description and skills'
+            rankings[candidate_id] = {'score': score, 'reasoning': reasoning}
+        return rankings
+
+    @staticmethod
+    def _build_page(page_ids: List[str], job_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Load the page candidates in order and build their full match breakdown"""
+        candidates = {}
+        if page_ids:
+            candidates = {
+                candidate.id: candidate
+                for candidate in db.session.query(CandidateProfile).filter(CandidateProfile.id.in_(page_ids))
+            }
+
+        paginated_candidates = []
+        for candidate_id in page_ids:
+            candidate = candidates.get(candidate_id)
+            if candidate is None:
+                continue
+            match_result = HiringMatchingService.calculate_overall_match(candidate, job_requirements)
+            paginated_candidates.append({
+                'candidate': candidate,
+                'match_score': match_result['match_score'],
+                'match_breakdown': match_result['match_breakdown']
+            })
+
+        return paginated_candidates
+
+    @staticmethod
+    def _rank_candidates_sql(query, job_requirements: Dict[str, Any], min_match_score: float,
+                             skill_match_threshold: float, sort_config: Dict[str, Any],
+                             top_k: Optional[int] = None, relevance=None) -> RankedResults:
+        """Score and rank in PostgreSQL, fetching only the first ``top_k`` ids (all when None)"""
+        from services import sql_scoring
+
+        # Fetching, scoring and sorting all happen in the one ranking query
+        with phase('scoring'):
+            return sql_scoring.rank(
+                query, job_requirements, min_match_score, skill_match_threshold, sort_config, top_k, relevance
+            )
+
+    @staticmethod
+    def _rank_candidates_vectorized(filtered_query, job_requirements: Dict[str, Any], min_match_score: float,
+                                    skill_match_threshold: float, sort_config: Dict[str, Any]) -> RankedResults:
+        """Score and rank the in-memory candidate pool with NumPy"""
+        # Resolve filters to candidate ids in the database, in query order
+        allowed_ids = None
+        filtered_ids: List[str] = []
+        if filtered_query is not None:
+            with phase('row_fetch'):
+                filtered_ids = [candidate_id for (candidate_id,) in filtered_query.with_entities(CandidateProfile.id)]
+            allowed_ids = set(filtered_ids)
+            record('candidates_scanned', len(filtered_ids))
+
+        experience_level = job_requirements.get('experience_level', '')
+        location = job_requirements.get('location', '')
+        is_remote = job_requirements.get('is_remote', False)
+        levels_by_rank = {rank: level for level, rank in HiringMatchingService.EXPERIENCE_LEVELS.items()}
+
+        # Scores and sorts the pool in one pass
+        with phase('scoring'):
+            ranked_ids, match_scores = candidate_scoring_engine.rank(
+                job_requirements, min_match_score, skill_match_threshold, sort_config,
+                score_location=lambda candidate_location: HiringMatchingService.calculate_location_match(
+                    candidate_location, location, is_remote)['score'],
+                score_experience=lambda rank: HiringMatchingService.calculate_experience_match(
+                    levels_by_rank.get(rank, ''), experience_level)['score'],
+                weights=HiringMatchingService.MATCH_WEIGHTS,
+                allowed_ids=allowed_ids
+            )
+
+        match_scores = match_scores.tolist()
+        if sort_config.get('field') == 'relevance' and filtered_query is not None:
+            # The filtered query is already in relevance order
+            with phase('sort'):
+                position = {candidate_id: index for index, candidate_id in enumerate(filtered_ids)}
+                ranked = sorted(zip(ranked_ids, match_scores), key=lambda item: position[item[0]])
+                ranked_ids, match_scores = [item[0] for item in ranked], [item[1] for item in ranked]
+
+        return RankedResults(ranked_ids, match_scores, len(ranked_ids))
+
+    @staticmethod
+    def get_candidates_list(page: int = 1, limit: int = 20, sort: str = 'name',
+                          order: str = 'asc', cursor: Optional[str] = None,
+                          keywords: Optional[str] = None) -> Dict[str, Any]:
+        """Get paginated list of all candidates.
+
+        Pages are addressed either by ``page`` or by the keyset ``cursor``
+        returned as ``next_cursor``; cursors seek past the previous page
+        instead of counting and skipping rows, and skip the total count.
+        ``keywords`` restricts the list to full-text matches, which can be
+        sorted by ``relevance`` (page-addressed only).
+        """
+        # Build query
+        query = db.session.query(CandidateProfile)
+        if keywords:
+            query = query.filter(HiringMatchingService.keyword_match(keywords))
+
+        if sort == 'relevance':
+            if not keywords:
+                raise ValueError('Sorting by relevance requires keywords')
+            if cursor:
+                raise ValueError('Cursor pagination is not supported when sorting by relevance')
+            relevance = HiringMatchingService.keyword_relevance(keywords)
+            query = query.order_by(relevance.asc() if order == 'asc' else relevance.desc(), CandidateProfile.id.asc())
+            return HiringMatchingService._paginate_keyset(
+                query, 'candidates', None, CandidateProfile.id, order == 'desc', page, limit, None
+            )
+
+        # Apply sorting, with id breaking ties in the same direction for keyset pagination
+        sort_columns = {
+            'name': CandidateProfile.name,
+            'experience': CandidateProfile.experience_level,
+            'location': CandidateProfile.location,
+            'created_at': CandidateProfile.created_at
         }
+        sort_column = sort_columns.get(sort, CandidateProfile.name)
+        # Experience is always listed in ascending level name order
+        descending = order == 'desc' and sort != 'experience'
+        if descending:
+            query = query.order_by(sort_column.desc(), CandidateProfile.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), CandidateProfile.id.asc())
+
+        return HiringMatchingService._paginate_keyset(
+            query, 'candidates', sort_column, CandidateProfile.id, descending, page, limit, cursor
+        )
 
     @staticmethod
     def get_job_postings_list(founder_id: str, page: int = 1, limit: int = 20,
-                            status: Optional[str] = None) -> Dict[str, Any]:
-        """Get paginated list of job postings for a founder"""
+                            status: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get paginated list of job postings for a founder, by page or keyset cursor"""
         query = db.session.query(JobPosting).filter(JobPosting.founder_id == founder_id)
 
         if status:
             query = query.filter(JobPosting.status == status)
 
-        query = query.order_by(JobPosting.posted_at.desc())
+        query = query.order_by(JobPosting.posted_at.desc(), JobPosting.id.desc())
 
-        # Get total count
-        total = query.count()
-
-        # Apply pagination
-        jobs = query.offset((page - 1) * limit).limit(limit).all()
+        return HiringMatchingService._paginate_keyset(
+            query, 'jobs', JobPosting.posted_at, JobPosting.id, True, page, limit, cursor
+        )
 
-        return {
-            'jobs': jobs,
-            'pagination': {
+    @staticmethod
+    def _paginate_keyset(query, items_key: str, sort_column, id_column, descending: bool,
+                         page: int, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        """Fetch one page of an ordered query by offset or keyset cursor, with the next cursor"""
+        if cursor:
+            query = query.filter(keyset_filter(cursor, sort_column, id_column, descending))
+            total = None
+            offset = 0
+        else:
+            # Get total count
+            total = query.count()
+            offset = (page - 1) * limit
+
+        # One extra row tells whether another page follows
+        rows = query.offset(offset).limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        # Expression orderings (sort_column None) are only addressed by page
+        next_cursor = keyset_cursor(rows[-1], sort_column, id_column) if has_next and sort_column is not None else None
+
+        if cursor:
+            pagination = {
+                'limit': limit,
+                'has_next': has_next,
+                'has_prev': True,
+                'next_cursor': next_cursor
+            }
+        else:
+            pagination = {
                 'page': page,
                 'limit': limit,
                 'total': total,
                 'total_pages': (total + limit - 1) // limit,
-                'has_next': page * limit < total,
-                'has_prev': page > 1
+                'has_next': has_next,
+                'has_prev': page > 1,
+                'next_cursor': next_cursor
             }
-        }
\ No newline at end of file
+
+        return {
+            items_key: rows,
+            'pagination': pagination
+        }
+
+# Columnar candidate pool for vectorized scoring
+candidate_scoring_engine = CandidateScoringEngine(
+    HiringMatchingService.normalize_skill,
+    HiringMatchingService.EXPERIENCE_LEVELS,
+    HiringMatchingService.AVAILABILITY_SCORES
+)
+
+
+@event.listens_for(CandidateProfile, 'before_insert')
+@event.listens_for(CandidateProfile, 'before_update')
+@event.listens_for(WorkExperience, 'before_insert')
+@event.listens_for(WorkExperience, 'before_update')
+def _maintain_normalized_skills(mapper, connection, target):
+    """Keep normalized_skills in step with skills on every ORM write"""
+    target.normalized_skills = HiringMatchingService.normalize_skills(target.skills)
+
+
+@event.listens_for(CandidateProfile, 'before_insert')
+@event.listens_for(CandidateProfile, 'before_update')
+def _maintain_candidate_coordinates(mapper, connection, target):
+    """Geocode location through the gazetteer on every ORM write"""
+    for column, value in HiringMatchingService.geocode_location(target.location).items():
+        setattr(target, column, value)
+
+
+@event.listens_for(CandidateProfile, 'before_insert')
+@event.listens_for(CandidateProfile, 'before_update')
+def _maintain_salary_columns(mapper, connection, target):
+    """Keep the USD salary columns in step with salary_expectations on every ORM write"""
+    target.salary_min_usd, target.salary_max_usd = HiringMatchingService.salary_range_usd(target.salary_expectations)
+
+
+@event.listens_for(JobPosting, 'before_insert')
+@event.listens_for(JobPosting, 'before_update')
+def _maintain_job_coordinates(mapper, connection, target):
+    """Geocode location through the gazetteer on every ORM write"""
+    coordinates = HiringMatchingService.geocode_location(target.location)
+    target.latitude, target.longitude = coordinates['latitude'], coordinates['longitude']
+
+
+@event.listens_for(JobPosting, 'before_insert')
+@event.listens_for(JobPosting, 'before_update')
+def _maintain_normalized_required_skills(mapper, connection, target):
+    """Keep normalized_required_skills in step with required_skills on every ORM write"""
+    target.normalized_required_skills = HiringMatchingService.normalize_skills(target.required_skills)
+
+
+@event.listens_for(SavedSearch, 'before_insert')
+@event.listens_for(SavedSearch, 'before_update')
+def _maintain_saved_search_prefilter_skills(mapper, connection, target):
+    """Keep prefilter_skills in step with search_criteria on every ORM write"""
+    target.prefilter_skills = HiringMatchingService.search_prefilter_skills(target.search_criteria or {})
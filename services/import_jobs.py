@@ -0,0 +1,268 @@
+from typing import Any, Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func
+from models import CandidateImportJob
+from db import db
+from services.candidate_import import CandidateImportService
+from datetime import datetime, timedelta
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Statuses of jobs that will not change any more
+FINISHED_STATUSES = frozenset({'completed', 'failed', 'cancelled'})
+UNFINISHED_STATUSES = ('queued', 'running')
+
+# Name prefix of spooled uploads, so leftovers can be told apart in a shared temp directory
+UPLOAD_PREFIX = 'candidate-import-'
+
+
+class ImportJobRunner:
+    """Runs candidate CSV imports as background jobs on a thread pool.
+
+    The upload is spooled to a temporary file so the request can return
+    right away. Job state lives in ``candidate_import_jobs``, so any web
+    process can report progress or request cancellation; the worker writes
+    its counts after every committed batch and stops at the next batch
+    boundary once cancellation is requested.
+
+    Jobs run in the process that accepted them, which marks its unfinished
+    jobs alive every ``IMPORT_HEARTBEAT_SECONDS``. A job not marked alive
+    for ``IMPORT_JOB_STALE_SECONDS`` lost its process: it is failed when
+    it is next read or cancelled, or when any process starts its runner,
+    and leftover uploads in this host's upload directory are removed then.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._workers = workers
+        self._upload_dir: Optional[str] = None
+        self._batch_size = 500
+        self._heartbeat_seconds = 30
+        self._stale_seconds = 120
+        self._app = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Jobs queued or running in this process
+        self._active: Set[str] = set()
+
+    def init_app(self, app):
+        self._app = app
+        self._workers = app.config.get('IMPORT_WORKERS', self._workers)
+        self._upload_dir = app.config.get('IMPORT_UPLOAD_DIR', self._upload_dir)
+        self._batch_size = app.config.get('IMPORT_BATCH_SIZE', self._batch_size)
+        self._heartbeat_seconds = app.config.get('IMPORT_HEARTBEAT_SECONDS', self._heartbeat_seconds)
+        self._stale_seconds = app.config.get('IMPORT_JOB_STALE_SECONDS', self._stale_seconds)
+
+    def _start(self) -> ThreadPoolExecutor:
+        """Start the worker pool and heartbeat on first use, reaping jobs other processes left behind"""
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='candidate-import')
+            threading.Thread(target=self._heartbeat, name='candidate-import-heartbeat', daemon=True).start()
+            executor = self._executor
+
+        self.reap_orphans()
+        return executor
+
+    def submit(self, file_storage, founder_id: str, mode: str = 'insert') -> CandidateImportJob:
+        """Spool an uploaded CSV to disk and queue its import in ``mode`` (insert or delta)"""
+        descriptor, path = tempfile.mkstemp(suffix='.csv', prefix=UPLOAD_PREFIX, dir=self._upload_dir)
+        os.close(descriptor)
+        try:
+            file_storage.save(path)
+            now = datetime.utcnow()
+            job = CandidateImportJob(founder_id=founder_id, filename=file_storage.filename, status='queued',
+                                     mode=mode, upload_path=path, heartbeat_at=now, created_at=now)
+            db.session.add(job)
+            db.session.commit()
+        except Exception:
+            os.remove(path)
+            raise
+
+        executor = self._start()
+        with self._lock:
+            self._active.add(job.id)
+        executor.submit(self._run, job.id, path)
+        return job
+
+    def reap_if_orphaned(self, job: CandidateImportJob) -> bool:
+        """Fail ``job`` if it is unfinished and its process stopped marking it alive; True if it was failed"""
+        if job.status in FINISHED_STATUSES or job.id in self._active:
+            return False
+        last_alive = job.heartbeat_at or job.updated_at or job.created_at
+        if last_alive is not None and last_alive >= self._stale_before():
+            return False
+        return self._reap(job)
+
+    def reap_orphans(self) -> int:
+        """Fail every unfinished job whose process stopped marking it alive and remove leftover uploads"""
+        reaped = 0
+        try:
+            orphans = db.session.query(CandidateImportJob).filter(self._orphaned()).all()
+            for job in orphans:
+                reaped += self._reap(job)
+            self._remove_leftover_uploads()
+        except Exception as e:
+            logger.error(f"Error reaping orphaned candidate import jobs: {str(e)}")
+            db.session.rollback()
+        return reaped
+
+    def cancel(self, job: CandidateImportJob) -> bool:
+        """Request cancellation; False when the job has already finished"""
+        if job.status in FINISHED_STATUSES:
+            return False
+        job.cancel_requested = True
+        if job.status == 'queued':
+            # Not picked up yet; the worker will skip it
+            job.status = 'cancelled'
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    def _stale_before(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self._stale_seconds)
+
+    def _orphaned(self):
+        """Criterion for unfinished jobs not marked alive recently and not running in this process"""
+        last_alive = func.coalesce(CandidateImportJob.heartbeat_at, CandidateImportJob.updated_at,
+                                   CandidateImportJob.created_at)
+        with self._lock:
+            active = list(self._active)
+        return (CandidateImportJob.status.in_(UNFINISHED_STATUSES)
+                & (last_alive < self._stale_before())
+                & CandidateImportJob.id.notin_(active))
+
+    def _reap(self, job: CandidateImportJob) -> bool:
+        # Conditional, so a heartbeat or finish that lands first wins
+        reaped = db.session.query(CandidateImportJob).filter(
+            CandidateImportJob.id == job.id,
+            self._orphaned()
+        ).update({
+            CandidateImportJob.status: 'failed',
+            CandidateImportJob.error: 'Import stopped: the process running it exited',
+            CandidateImportJob.finished_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        if not reaped:
+            return False
+
+        logger.warning(f"Candidate import job {job.id} lost its process; marked failed")
+        if job.upload_path:
+            self._remove_upload(job.upload_path)
+        return True
+
+    def _remove_leftover_uploads(self):
+        """Remove spooled uploads in this host's upload directory that no unfinished job needs"""
+        directory = self._upload_dir or tempfile.gettempdir()
+        needed = {path for (path,) in db.session.query(CandidateImportJob.upload_path).filter(
+            CandidateImportJob.status.in_(UNFINISHED_STATUSES)
+        )}
+        # Leave recent files alone: an upload is spooled before its job is committed
+        cutoff = time.time() - self._stale_seconds
+        for entry in os.scandir(directory):
+            if (entry.name.startswith(UPLOAD_PREFIX) and entry.name.endswith('.csv') and entry.path not in needed
+                    and entry.stat().st_mtime < cutoff):
+                self._remove_upload(entry.path)
+
+    @staticmethod
+    def _remove_upload(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing candidate import upload {path}: {str(e)}")
+
+    def _heartbeat(self):
+        """Mark this process's unfinished jobs alive until the process exits"""
+        while True:
+            time.sleep(self._heartbeat_seconds)
+            with self._lock:
+                job_ids = list(self._active)
+            if not job_ids:
+                continue
+            with self._app.app_context():
+                try:
+                    db.session.query(CandidateImportJob).filter(
+                        CandidateImportJob.id.in_(job_ids)
+                    ).update({CandidateImportJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+                    db.session.commit()
+                except Exception as e:
+                    logger.error(f"Error recording candidate import heartbeat: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+    def _run(self, job_id: str, path: str):
+        with self._app.app_context():
+            try:
+                self._run_job(job_id, path)
+            except Exception as e:
+                logger.error(f"Error running candidate import job {job_id}: {str(e)}")
+                db.session.rollback()
+                job = db.session.get(CandidateImportJob, job_id)
+                if job is not None and job.status not in FINISHED_STATUSES:
+                    self._finish(job, 'failed', error=str(e))
+            finally:
+                with self._lock:
+                    self._active.discard(job_id)
+                self._remove_upload(path)
+                db.session.remove()
+
+    def _run_job(self, job_id: str, path: str):
+        job = db.session.get(CandidateImportJob, job_id)
+        if job is None or job.cancel_requested or job.status != 'queued':
+            return
+
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+
+        def on_batch(summary: Dict[str, Any]) -> bool:
+            self._record_progress(job, summary)
+            db.session.commit()
+            # The commit expired the job, so this reads the current flag and status
+            return not job.cancel_requested and job.status == 'running'
+
+        with open(path, 'rb') as stream:
+            summary = CandidateImportService.import_csv(stream, self._batch_size, on_batch, delta=job.mode == 'delta')
+
+        self._record_progress(job, summary)
+        if job.status != 'running':
+            # Another process took this one for dead and failed the job; keep that outcome
+            db.session.commit()
+            logger.warning(f"Candidate import job {job_id} was failed by another process; stopped")
+            return
+        if summary['decode_error']:
+            self._finish(job, 'failed', error=f"File must be UTF-8 encoded: {summary['decode_error']}")
+        elif summary['cancelled']:
+            self._finish(job, 'cancelled')
+        else:
+            self._finish(job, 'completed')
+        logger.info(f"Candidate import job {job_id} {job.status}: {job.imported} imported, {job.updated} updated, "
+                    f"{job.skipped} skipped, {job.errors} errors")
+
+    @staticmethod
+    def _record_progress(job: CandidateImportJob, summary: Dict[str, Any]):
+        job.imported = summary['imported']
+        job.updated = summary['updated']
+        job.skipped = summary['skipped']
+        job.errors = summary['errors']
+        job.rows_processed = summary['imported'] + summary['updated'] + summary['skipped'] + summary['errors']
+        job.error_details = list(summary['error_details'])
+
+    @staticmethod
+    def _finish(job: CandidateImportJob, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+# Background candidate imports
+import_job_runner = ImportJobRunner()
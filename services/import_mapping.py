@@ -0,0 +1,118 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Settings handed to each worker process so it loads the same taxonomy and gazetteer
+_WORKER_CONFIG_KEYS = (
+    'SKILL_TAXONOMY_PATH',
+    'GAZETTEER_PATH',
+)
+
+Row = Tuple[int, Dict[str, str]]
+MappedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _init_worker(worker_config: Dict[str, Any]):
+    """Load the lookup tables row mapping needs; workers never touch the database"""
+    from services.skill_taxonomy import skill_taxonomy
+    from services.gazetteer import gazetteer
+
+    app = Flask(__name__)
+    app.config.update(worker_config)
+    skill_taxonomy.init_app(app)
+    gazetteer.init_app(app)
+
+
+def _map_rows(rows: List[Row]) -> List[MappedRow]:
+    """Map one batch of CSV rows in a pool process"""
+    from services.candidate_import import CandidateImportService
+
+    return CandidateImportService.map_rows(rows)
+
+
+class ImportMappingExecutor:
+    """Maps CSV row batches to insertable candidates across a process pool.
+
+    Mapping parses skills, addresses and enums, normalizes skills and
+    geocodes locations: CPU work that would otherwise hold the GIL while
+    the import waits on the database. Batches are read ahead up to two per
+    worker and their results come back in file order, so reading, mapping
+    and inserting overlap.
+    """
+
+    def __init__(self, workers: int = 0):
+        self._workers = workers
+        self._worker_config: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def init_app(self, app):
+        self._workers = app.config.get('IMPORT_MAPPING_WORKERS', self._workers)
+        self._worker_config = {key: app.config[key] for key in _WORKER_CONFIG_KEYS if key in app.config}
+
+    @property
+    def enabled(self) -> bool:
+        return self._workers > 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the parent holds threads and pooled database connections
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self._worker_config,)
+                )
+                logger.info(f"Started import mapping pool: {self._workers} workers")
+            return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes; the next import starts fresh ones"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def map_batches(self, batches: Iterable[List[Row]]) -> Iterator[List[MappedRow]]:
+        """Yield the mapped rows of each batch in order.
+
+        An error reading the batches, e.g. undecodable bytes, is raised only
+        after the batches read before it have been yielded. Batches still
+        queued when the caller stops iterating are cancelled.
+        """
+        pool = self._get_pool()
+        batches = iter(batches)
+        pending = deque()
+        read_error: Optional[Exception] = None
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self._workers * 2:
+                    try:
+                        batch = next(batches)
+                    except StopIteration:
+                        exhausted = True
+                    except Exception as e:
+                        read_error = e
+                        exhausted = True
+                    else:
+                        pending.append(pool.submit(_map_rows, batch))
+                if not pending:
+                    break
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+        if read_error is not None:
+            raise read_error
+
+
+# Process pool mapping candidate CSV rows during imports
+import_mapping_executor = ImportMappingExecutor(workers=2)
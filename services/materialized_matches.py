@@ -0,0 +1,361 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models import CandidateProfile, JobCandidateMatch, JobPosting, SavedSearch, SavedSearchResult
+from db import db
+from services import model_events
+from services.hiring import HiringMatchingService
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Candidate columns needed to filter and score one candidate against a search
+_CANDIDATE_COLUMNS = (
+    CandidateProfile.id,
+    CandidateProfile.skills,
+    CandidateProfile.normalized_skills,
+    CandidateProfile.experience_level,
+    CandidateProfile.availability,
+    CandidateProfile.work_auth_status,
+    CandidateProfile.location,
+    CandidateProfile.latitude,
+    CandidateProfile.longitude,
+    CandidateProfile.salary_min_usd,
+    CandidateProfile.salary_max_usd,
+)
+
+
+class MaterializedMatches:
+    """Top-N candidate rankings persisted per owner row and kept current on candidate writes.
+
+    Subclasses bind a result table (one row per owner and candidate with the
+    match score and its components) to an owner model whose
+    ``refreshed_column`` records when its ranking was last fully computed.
+    A full refresh ranks the whole pool; afterwards each committed candidate
+    write rescores only the written candidates against the owners they can
+    match. When a candidate leaves a full top-N, or a member's score drops
+    to where a candidate outside it may now rank higher, the next one down
+    is unknown, so the owner is marked for a full refresh on its next read.
+    Bulk writes of at least ``bulk_refresh_threshold`` candidates mark every
+    owner that way instead, since ranking the pool once per owner is cheaper
+    than rescoring that many candidates against each of them.
+    """
+
+    result_model = None
+    owner_model = None
+    owner_column = None
+    refreshed_column = None
+    limit_config_key = None
+
+    def __init__(self, limit: int = 500, bulk_refresh_threshold: int = 200):
+        self._limit = limit
+        self._bulk_refresh_threshold = bulk_refresh_threshold
+
+    def init_app(self, app):
+        self._limit = app.config.get(self.limit_config_key, self._limit)
+        self._bulk_refresh_threshold = app.config.get('MATCH_BULK_REFRESH_THRESHOLD', self._bulk_refresh_threshold)
+        model_events.track(CandidateProfile)
+        model_events.on_change(CandidateProfile, self._on_candidates_changed)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def search_request_for(self, owner) -> Dict[str, Any]:
+        """The candidate search request an owner row stands for"""
+        raise NotImplementedError
+
+    def _maintained_owners(self, connection, skills: Set[str], member_owner_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        """Search requests of materialized owners, by owner id.
+
+        Only owners that may match a candidate with one of ``skills`` or that
+        already hold a written candidate (``member_owner_ids``) are needed.
+        """
+        raise NotImplementedError
+
+    def _owner_id_column(self):
+        return getattr(self.result_model, self.owner_column)
+
+    def refresh(self, owner):
+        """Recompute an owner's ranking from the whole candidate pool"""
+        search_request = dict(self.search_request_for(owner))
+        search_request['sort'] = {'field': 'match_score', 'order': 'desc'}
+        ranked_ids = HiringMatchingService.rank_search(search_request, top_k=self._limit).candidate_ids[:self._limit]
+
+        rows = []
+        if ranked_ids:
+            candidates = db.session.query(*_CANDIDATE_COLUMNS).filter(
+                CandidateProfile.id.in_(ranked_ids)
+            ).all()
+            for candidate in candidates:
+                match_result = HiringMatchingService.score_candidate_for_search(candidate, search_request)
+                if match_result is not None:
+                    rows.append(self._result_row(owner.id, candidate.id, match_result))
+
+        owner_id_column = self._owner_id_column()
+        self._upsert(db.session, rows)
+        stale = db.session.query(self.result_model).filter(owner_id_column == owner.id)
+        if ranked_ids:
+            stale = stale.filter(self.result_model.candidate_id.notin_(ranked_ids))
+        stale.delete(synchronize_session=False)
+
+        setattr(owner, self.refreshed_column, datetime.utcnow())
+        db.session.commit()
+
+    def clear(self, owner):
+        """Drop an owner's ranking, e.g. when it stops being maintained"""
+        db.session.query(self.result_model).filter(self._owner_id_column() == owner.id).delete(synchronize_session=False)
+        setattr(owner, self.refreshed_column, None)
+        db.session.commit()
+
+    def ensure_fresh(self, owner):
+        if getattr(owner, self.refreshed_column) is None:
+            self.refresh(owner)
+
+    def page(self, owner, page: int = 1, limit: int = 20,
+             since: Optional[datetime] = None) -> Dict[str, Any]:
+        """One page of an owner's ranking, optionally only candidates matched after ``since``"""
+        self.ensure_fresh(owner)
+
+        query = db.session.query(self.result_model.candidate_id).filter(self._owner_id_column() == owner.id)
+        if since is not None:
+            query = query.filter(self.result_model.matched_at > since)
+
+        total = query.count()
+        page_ids = [candidate_id for (candidate_id,) in query.order_by(
+            self.result_model.match_score.desc(), self.result_model.candidate_id.desc()
+        ).offset((page - 1) * limit).limit(limit)]
+
+        search_request = self.search_request_for(owner)
+        use_ai_ranking = (search_request.get('matching') or {}).get('use_ai_ranking', True)
+        return {
+            'candidates': list(HiringMatchingService._iter_page(
+                page_ids, search_request.get('job_requirements') or {}, use_ai_ranking=use_ai_ranking
+            )),
+            'pagination': {
+                'page': page,
+                'limit': limit,
+                'total': total,
+                'total_pages': (total + limit - 1) // limit,
+                'has_next': page * limit < total,
+                'has_prev': page > 1
+            }
+        }
+
+    def _result_row(self, owner_id: str, candidate_id: str, match_result: Dict[str, Any]) -> Dict[str, Any]:
+        breakdown = match_result['match_breakdown']
+        return {
+            self.owner_column: owner_id,
+            'candidate_id': candidate_id,
+            'match_score': match_result['match_score'],
+            'skills_score': breakdown['skills_match']['score'],
+            'experience_score': breakdown['experience_match']['score'],
+            'location_score': breakdown['location_match']['score'],
+            'availability_score': breakdown['availability_match']['score'],
+        }
+
+    def _upsert(self, executor, rows: List[Dict[str, Any]]):
+        """Insert or rescore result rows, keeping matched_at of rows already present"""
+        if not rows:
+            return
+        now = datetime.utcnow()
+        # Executemany form: the statement compiles once and rows are batched into multi-row VALUES
+        statement = insert(self.result_model.__table__)
+        executor.execute(statement.on_conflict_do_update(
+            index_elements=[self.owner_column, 'candidate_id'],
+            set_={
+                'match_score': statement.excluded.match_score,
+                'skills_score': statement.excluded.skills_score,
+                'experience_score': statement.excluded.experience_score,
+                'location_score': statement.excluded.location_score,
+                'availability_score': statement.excluded.availability_score,
+                'updated_at': statement.excluded.updated_at,
+            }
+        ), [dict(row, matched_at=now, updated_at=now) for row in rows])
+
+    def _on_candidates_changed(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        # Read and write on a separate connection; the committing session can't emit SQL here
+        with db.engine.begin() as connection:
+            self.apply_candidate_changes(connection, upserted_ids, deleted_ids)
+
+    def apply_candidate_changes(self, connection, upserted_ids: Iterable[str], deleted_ids: Iterable[str]):
+        """Rescore written candidates against every materialized owner they can affect"""
+        upserted_ids, deleted_ids = set(upserted_ids), set(deleted_ids)
+        if not (upserted_ids or deleted_ids):
+            return
+
+        if len(upserted_ids) >= self._bulk_refresh_threshold:
+            owner_table = self.owner_model.__table__
+            refreshed_column = owner_table.c[self.refreshed_column]
+            connection.execute(owner_table.update().where(refreshed_column.isnot(None))
+                               .values({self.refreshed_column: None}))
+            return
+
+        table = self.result_model.__table__
+        owner_id_column = table.c[self.owner_column]
+        changed_ids = upserted_ids | deleted_ids
+
+        # Current memberships of the written candidates, with their stored scores
+        members: Dict[Tuple[str, str], float] = {
+            (owner_id, candidate_id): match_score for owner_id, candidate_id, match_score in connection.execute(
+                db.select(owner_id_column, table.c.candidate_id, table.c.match_score)
+                .where(table.c.candidate_id.in_(changed_ids))
+            )
+        }
+
+        candidates = []
+        if upserted_ids:
+            candidates = connection.execute(
+                db.select(*_CANDIDATE_COLUMNS).where(CandidateProfile.id.in_(upserted_ids))
+            ).all()
+
+        candidate_skills = {skill for candidate in candidates for skill in (candidate.normalized_skills or ())}
+        owners = self._maintained_owners(connection, candidate_skills, {owner_id for owner_id, _ in members})
+
+        # Written candidates that no longer exist leave every ranking
+        gone_ids = changed_ids - {candidate.id for candidate in candidates}
+        upserts: List[Dict[str, Any]] = []
+        removals: List[Tuple[str, str]] = [member for member in members if member[1] in gone_ids]
+        for owner_id, search_request in owners.items():
+            prefilter_skills = HiringMatchingService.search_prefilter_skills(search_request)
+            if prefilter_skills is not None:
+                prefilter_skills = set(prefilter_skills)
+            # Keyword filters are evaluated in the database
+            keywords = (search_request.get('filters') or {}).get('keywords')
+            keyword_ids = None
+            if keywords and candidates:
+                keyword_ids = set(connection.execute(
+                    db.select(CandidateProfile.id).where(
+                        CandidateProfile.id.in_([candidate.id for candidate in candidates]),
+                        HiringMatchingService.keyword_match(keywords)
+                    )
+                ).scalars())
+            for candidate in candidates:
+                is_member = (owner_id, candidate.id) in members
+                # Candidates sharing no skill with the search can't qualify
+                if (not is_member and prefilter_skills is not None
+                        and prefilter_skills.isdisjoint(candidate.normalized_skills or ())):
+                    continue
+                match_result = None
+                if keyword_ids is None or candidate.id in keyword_ids:
+                    match_result = HiringMatchingService.score_candidate_for_search(candidate, search_request)
+                if match_result is not None:
+                    upserts.append(self._result_row(owner_id, candidate.id, match_result))
+                elif is_member:
+                    removals.append((owner_id, candidate.id))
+
+        touched_owners = {row[self.owner_column] for row in upserts} | {owner_id for owner_id, _ in removals}
+        if not touched_owners:
+            return
+
+        # Size and lowest score of each touched ranking before this change
+        counts: Dict[str, int] = {}
+        lowest_scores: Dict[str, float] = {}
+        for owner_id, count, lowest_score in connection.execute(
+            db.select(owner_id_column, func.count(), func.min(table.c.match_score))
+            .where(owner_id_column.in_(touched_owners))
+            .group_by(owner_id_column)
+        ):
+            counts[owner_id], lowest_scores[owner_id] = count, lowest_score
+
+        for owner_id, candidate_id in removals:
+            connection.execute(table.delete().where(
+                owner_id_column == owner_id, table.c.candidate_id == candidate_id
+            ))
+        self._upsert(connection, upserts)
+
+        # A full top-N that lost a member no longer knows its next candidate. Candidates outside it
+        # score at most its lowest score, so a member dropping to that score may now rank below one of them.
+        stale_owners = {owner_id for owner_id, _ in removals}
+        for row in upserts:
+            key = (row[self.owner_column], row['candidate_id'])
+            if key in members and row['match_score'] < members[key] and row['match_score'] <= lowest_scores[key[0]]:
+                stale_owners.add(key[0])
+        stale_owners = {owner_id for owner_id in stale_owners if counts.get(owner_id, 0) >= self._limit}
+        if stale_owners:
+            owner_table = self.owner_model.__table__
+            connection.execute(owner_table.update().where(owner_table.c.id.in_(stale_owners))
+                               .values({self.refreshed_column: None}))
+
+        # Keep only the top N of owners that gained candidates
+        for owner_id in touched_owners - stale_owners:
+            overflow = (
+                db.select(table.c.candidate_id)
+                .where(owner_id_column == owner_id)
+                .order_by(table.c.match_score.desc(), table.c.candidate_id.desc())
+                .offset(self._limit)
+            )
+            connection.execute(table.delete().where(
+                owner_id_column == owner_id, table.c.candidate_id.in_(overflow)
+            ))
+
+
+class SavedSearchResults(MaterializedMatches):
+    """Materialized results of saved searches"""
+
+    result_model = SavedSearchResult
+    owner_model = SavedSearch
+    owner_column = 'saved_search_id'
+    refreshed_column = 'results_refreshed_at'
+    limit_config_key = 'SAVED_SEARCH_RESULT_LIMIT'
+
+    def search_request_for(self, saved_search) -> Dict[str, Any]:
+        return saved_search.search_criteria or {}
+
+    def _maintained_owners(self, connection, skills: Set[str], member_owner_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        # Look up saved searches by their prefilter skills in the skill index
+        reachable = HiringMatchingService.saved_searches_reachable_by_any(skills)
+        if member_owner_ids:
+            reachable = or_(reachable, SavedSearch.id.in_(member_owner_ids))
+        rows = connection.execute(
+            db.select(SavedSearch.id, SavedSearch.search_criteria)
+            .where(SavedSearch.results_refreshed_at.isnot(None), reachable)
+        )
+        return {saved_search_id: criteria or {} for saved_search_id, criteria in rows}
+
+
+class JobMatches(MaterializedMatches):
+    """Precomputed candidate matches of active job postings"""
+
+    result_model = JobCandidateMatch
+    owner_model = JobPosting
+    owner_column = 'job_id'
+    refreshed_column = 'matches_refreshed_at'
+    limit_config_key = 'JOB_MATCH_LIMIT'
+
+    @staticmethod
+    def job_requirements_for(job) -> Dict[str, Any]:
+        return {
+            'title': job.title,
+            'job_description': job.job_description,
+            'required_skills': job.required_skills or [],
+            'preferred_skills': job.preferred_skills or [],
+            'experience_level': job.experience_level,
+            'location': job.location,
+            'is_remote': bool(job.is_remote)
+        }
+
+    def search_request_for(self, job) -> Dict[str, Any]:
+        # Default matching thresholds, as a search without matching criteria
+        return {'job_requirements': self.job_requirements_for(job), 'filters': {}, 'matching': {}}
+
+    def _maintained_owners(self, connection, skills: Set[str], member_owner_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        # Jobs use the default skill threshold, which takes a required skill; look them up in the skill index
+        reachable = HiringMatchingService.active_jobs_requiring_any(skills)
+        if member_owner_ids:
+            reachable = or_(reachable, JobPosting.id.in_(member_owner_ids))
+        rows = connection.execute(
+            db.select(JobPosting.id, JobPosting.title, JobPosting.job_description,
+                      JobPosting.required_skills, JobPosting.preferred_skills,
+                      JobPosting.experience_level, JobPosting.location, JobPosting.is_remote)
+            .where(JobPosting.status == 'active', JobPosting.matches_refreshed_at.isnot(None), reachable)
+        )
+        return {job.id: self.search_request_for(job) for job in rows}
+
+
+# Materialized saved search results
+saved_search_results = SavedSearchResults()
+
+# Precomputed job-to-candidate matches
+job_matches = JobMatches()
@@ -0,0 +1,96 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+# model class -> callbacks taking (upserted_ids, deleted_ids)
+_listeners: Dict[type, List[Callable[[Set[str], Set[str]], None]]] = {}
+
+# tracked model class -> (reported model class, key function)
+_tracked: Dict[type, Tuple[type, Callable[[Any], Optional[str]]]] = {}
+
+_SESSION_KEY = 'model_changes'
+_registered = False
+
+
+def track(model, target=None, key: Optional[Callable] = None):
+    """Report committed changes to `model` rows as changes to `target` rows.
+
+    By default a row is reported as itself (by primary key ``id``). Child
+    tables can be reported against their parent, e.g. a WorkExperience
+    change is a change to the owning CandidateProfile.
+    """
+    _tracked[model] = (target or model, key or (lambda obj: obj.id))
+
+
+def on_change(model, callback: Callable[[Set[str], Set[str]], None]):
+    """Register a callback fired after commit with (upserted_ids, deleted_ids)"""
+    _listeners.setdefault(model, []).append(callback)
+    return callback
+
+
+def notify(model, upserted_ids: Iterable[str] = (), deleted_ids: Iterable[str] = ()):
+    """Dispatch a change notification for writes that bypass the ORM unit of work"""
+    deleted = set(deleted_ids)
+    upserted = set(upserted_ids) - deleted
+    if not upserted and not deleted:
+        return
+
+    for callback in _listeners.get(model, []):
+        try:
+            callback(upserted, deleted)
+        except Exception as e:
+            # A stale cache must never fail the write that triggered it
+            logger.error(f"Error in change listener for {model.__name__}: {str(e)}")
+
+
+def _collect_changes(session, flush_context):
+    """Record tracked rows touched by a flush until the transaction ends"""
+    pending = session.info.setdefault(_SESSION_KEY, {})
+
+    def record(obj, deleted):
+        tracked = _tracked.get(type(obj))
+        if not tracked:
+            return
+        target, key = tracked
+        obj_id = key(obj)
+        if obj_id is None:
+            return
+        upserted_ids, deleted_ids = pending.setdefault(target, (set(), set()))
+        # Deleting a child row is an update of its parent
+        if deleted and target is type(obj):
+            deleted_ids.add(obj_id)
+        else:
+            upserted_ids.add(obj_id)
+
+    for obj in session.new:
+        record(obj, False)
+    for obj in session.dirty:
+        record(obj, False)
+    for obj in session.deleted:
+        record(obj, True)
+
+
+def _dispatch_changes(session):
+    pending = session.info.pop(_SESSION_KEY, None)
+    if not pending:
+        return
+    for model, (upserted_ids, deleted_ids) in pending.items():
+        notify(model, upserted_ids, deleted_ids)
+
+
+def _discard_changes(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def init_app(app):
+    """Hook commit/rollback on every ORM session"""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, 'after_flush', _collect_changes)
+    event.listen(Session, 'after_commit', _dispatch_changes)
+    event.listen(Session, 'after_rollback', _discard_changes)
+    _registered = True
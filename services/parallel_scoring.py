@@ -0,0 +1,151 @@
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask
+from services.search_cache import RankedResults
+import heapq
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Pool-level settings handed to each worker process so it can open its own app context
+_WORKER_CONFIG_KEYS = (
+    'SQLALCHEMY_DATABASE_URI',
+    'SQLALCHEMY_ENGINE_OPTIONS',
+    'SKILL_TAXONOMY_PATH',
+    'GAZETTEER_PATH',
+    'SCORE_MEMO_MAX_ENTRIES',
+)
+
+_HEX_DIGITS = '0123456789abcdef'
+
+Shard = Tuple[Optional[str], Optional[str]]
+
+
+def shard_bounds(shard_count: int) -> List[Shard]:
+    """Split the candidate id space into ``shard_count`` contiguous ranges.
+
+    Candidate ids are UUID strings, so evenly spaced two-hex-digit prefixes
+    give shards of about the same size that each read one primary key index
+    range. The first and last shards are open-ended so every id falls in
+    exactly one shard.
+    """
+    shard_count = max(1, min(shard_count, 256))
+    prefixes = [_HEX_DIGITS[(i * 256 // shard_count) // 16] + _HEX_DIGITS[(i * 256 // shard_count) % 16]
+                for i in range(1, shard_count)]
+    lower_bounds = [None] + prefixes
+    upper_bounds = prefixes + [None]
+    return list(zip(lower_bounds, upper_bounds))
+
+
+def _init_worker(worker_config: Dict[str, Any]):
+    """Open a long-lived app context with its own database engine in a pool process"""
+    from db import db
+    from services.skill_taxonomy import skill_taxonomy
+    from services.gazetteer import gazetteer
+    from services.search_cache import match_score_memo
+
+    app = Flask(__name__)
+    app.config.update(worker_config)
+    db.init_app(app)
+    skill_taxonomy.init_app(app)
+    gazetteer.init_app(app)
+    match_score_memo.init_app(app)
+    app.app_context().push()
+
+
+def _rank_shard(search_request: Dict[str, Any], shard: Shard, top_k: Optional[int]) -> RankedResults:
+    """Rank the candidates of one id range in a pool process"""
+    from db import db
+    from models import CandidateProfile
+    from services.hiring import HiringMatchingService
+
+    lower, upper = shard
+    query = db.session.query(CandidateProfile)
+    if lower is not None:
+        query = query.filter(CandidateProfile.id >= lower)
+    if upper is not None:
+        query = query.filter(CandidateProfile.id < upper)
+    try:
+        return HiringMatchingService.rank_search(search_request, top_k, base_query=query)
+    finally:
+        db.session.remove()
+
+
+class ParallelScoringExecutor:
+    """Ranks a search across a process pool, one candidate id range per task.
+
+    Each worker process filters, loads and scores its own shard with the
+    in-process Python ranking and returns the shard's top ``top_k`` plus its
+    qualifying count. The shard results are merged into the global top
+    ``top_k`` by match score; totals are summed. Scores are identical to
+    the single-process ranking, and the pool sidesteps the GIL for large
+    candidate pools.
+    """
+
+    def __init__(self, workers: int = 0):
+        self._workers = workers
+        self._worker_config: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def init_app(self, app):
+        self._workers = app.config.get('SCORING_WORKERS', self._workers)
+        self._worker_config = {key: app.config[key] for key in _WORKER_CONFIG_KEYS if key in app.config}
+
+    @property
+    def enabled(self) -> bool:
+        return self._workers > 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the parent holds threads and pooled database connections
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self._worker_config,)
+                )
+                logger.info(f"Started parallel scoring pool: {self._workers} workers")
+            return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes; the next ranking starts fresh ones"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def rank(self, search_request: Dict[str, Any], top_k: Optional[int] = None) -> RankedResults:
+        """Rank a search sorted by match score across the pool"""
+        sort_config = search_request.get('sort') or {'field': 'match_score', 'order': 'desc'}
+        descending = sort_config.get('order', 'desc') == 'desc'
+        # Workers run the single-process ranking on their shard
+        shard_request = dict(search_request)
+        shard_request['matching'] = dict(search_request.get('matching') or {}, scoring_mode='python')
+
+        pool = self._get_pool()
+        futures = [pool.submit(_rank_shard, shard_request, shard, top_k) for shard in shard_bounds(self._workers)]
+
+        total = 0
+        entries: List[Tuple[float, int, int, str]] = []  # (score, shard, rank within shard, id)
+        for shard_index, future in enumerate(futures):
+            ranked = future.result()
+            total += ranked.total
+            entries.extend((score, shard_index, rank, candidate_id)
+                           for rank, (candidate_id, score) in enumerate(zip(ranked.candidate_ids, ranked.match_scores)))
+
+        # Ties keep shard order and then each shard's own order
+        if descending:
+            key = lambda entry: (entry[0], -entry[1], -entry[2])
+            top = heapq.nlargest(top_k, entries, key=key) if top_k is not None else sorted(entries, key=key, reverse=True)
+        else:
+            key = lambda entry: (entry[0], entry[1], entry[2])
+            top = heapq.nsmallest(top_k, entries, key=key) if top_k is not None else sorted(entries, key=key)
+        return RankedResults([entry[3] for entry in top], [entry[0] for entry in top], total)
+
+
+# Process pool behind the 'parallel' scoring mode
+parallel_scoring_executor = ParallelScoringExecutor(workers=4)
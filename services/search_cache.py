@@ -0,0 +1,288 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from collections import OrderedDict
+from models import CandidateProfile
+from services import model_events
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class RankedResults(NamedTuple):
+    """Candidate ids in sort order with their match scores.
+
+    ``candidate_ids`` may hold only the leading part of the ranking; ``total``
+    is always the full number of qualifying candidates.
+    """
+    candidate_ids: List[str]
+    match_scores: List[float]
+    total: int
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.candidate_ids) >= self.total
+
+    def covers(self, count: int) -> bool:
+        """Whether the first ``count`` ranked candidates are available"""
+        return self.is_complete or len(self.candidate_ids) >= count
+
+    def prefix(self, count: int) -> 'RankedResults':
+        """The first ``count`` ranked candidates, keeping the full total"""
+        if len(self.candidate_ids) <= count:
+            return self
+        return RankedResults(self.candidate_ids[:count], self.match_scores[:count], self.total)
+
+
+class SearchResultCache:
+    """LRU cache of ranked search results with a TTL.
+
+    Entries are keyed by a canonical hash of the search request without its
+    pagination, so every page of a search is a slice of one cached ranking.
+    Any committed candidate write bumps the cache version, which drops every
+    entry; the cache is per process, so the TTL bounds staleness from writes
+    made by other workers.
+
+    Snapshots pin a ranking for cursor pagination. They are not dropped on
+    writes, so a client paging through a search sees a stable order; they
+    expire on their own TTL and LRU bound. A snapshot holds only a prefix
+    of the ranking, extended as clients page past it, and searches repeated
+    at the same cache version share one snapshot.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300,
+                 max_snapshots: int = 1024, snapshot_ttl_seconds: float = 1800):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._max_snapshots = max_snapshots
+        self._snapshot_ttl_seconds = snapshot_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (stored_at, version, results)
+        self._snapshots: 'OrderedDict[str, tuple]' = OrderedDict()  # snapshot id -> (stored_at, key, version, results)
+        self._snapshot_ids: Dict[tuple, str] = {}  # (key, version) -> snapshot id
+        self._version = 0
+
+    def init_app(self, app):
+        """Read limits from config and invalidate on candidate writes"""
+        self._max_entries = app.config.get('SEARCH_CACHE_MAX_ENTRIES', self._max_entries)
+        self._ttl_seconds = app.config.get('SEARCH_CACHE_TTL', self._ttl_seconds)
+        self._max_snapshots = app.config.get('SEARCH_SNAPSHOT_MAX_ENTRIES', self._max_snapshots)
+        self._snapshot_ttl_seconds = app.config.get('SEARCH_SNAPSHOT_TTL', self._snapshot_ttl_seconds)
+        model_events.track(CandidateProfile)
+        model_events.on_change(CandidateProfile, self._on_candidates_changed)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl_seconds > 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def key_for(search_request: Dict[str, Any]) -> str:
+        """Canonical hash of a validated search request, ignoring pagination"""
+        canonical = {name: value for name, value in search_request.items() if name != 'pagination'}
+        payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[RankedResults]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, version, results = entry
+            if version != self._version or time.monotonic() - stored_at > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def put(self, key: str, results: RankedResults, version: Optional[int] = None):
+        """Store a ranking computed while the cache was at ``version``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                # Candidates changed while ranking; the result may already be stale
+                return
+            self._entries[key] = (time.monotonic(), self._version, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def snapshots_enabled(self) -> bool:
+        return self.enabled and self._max_snapshots > 0 and self._snapshot_ttl_seconds > 0
+
+    def save_snapshot(self, key: str, results: RankedResults, length: int,
+                      version: Optional[int] = None) -> Optional[str]:
+        """Pin the first ``length`` candidates of a ranking computed at cache ``version`` and return the snapshot id.
+
+        A live snapshot of the same search and version is reused as is.
+        Returns None while snapshots are disabled.
+        """
+        if not self.snapshots_enabled:
+            return None
+        with self._lock:
+            if version == self._version:
+                snapshot_id = self._snapshot_ids.get((key, version))
+                entry = self._snapshots.get(snapshot_id) if snapshot_id is not None else None
+                if entry is not None and time.monotonic() - entry[0] <= self._snapshot_ttl_seconds:
+                    self._snapshots[snapshot_id] = (time.monotonic(),) + entry[1:]
+                    self._snapshots.move_to_end(snapshot_id)
+                    return snapshot_id
+            snapshot_id = uuid.uuid4().hex
+            self._store_snapshot(snapshot_id, key, version, results.prefix(length))
+            if version == self._version:
+                self._snapshot_ids[(key, version)] = snapshot_id
+            return snapshot_id
+
+    def update_snapshot(self, snapshot_id: str, key: str, results: RankedResults, length: int):
+        """Replace a snapshot's ranking with the first ``length`` candidates of ``results``"""
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+            version = entry[2] if entry is not None else None
+            self._store_snapshot(snapshot_id, key, version, results.prefix(length))
+
+    def _store_snapshot(self, snapshot_id: str, key: str, version: Optional[int], results: RankedResults):
+        self._snapshots[snapshot_id] = (time.monotonic(), key, version, results)
+        self._snapshots.move_to_end(snapshot_id)
+        while len(self._snapshots) > self._max_snapshots:
+            evicted_id, (_, evicted_key, evicted_version, _) = self._snapshots.popitem(last=False)
+            if self._snapshot_ids.get((evicted_key, evicted_version)) == evicted_id:
+                del self._snapshot_ids[(evicted_key, evicted_version)]
+
+    def get_snapshot(self, snapshot_id: str, key: str) -> Optional[RankedResults]:
+        """Return a pinned ranking if it is still live and belongs to the search ``key``"""
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+            if entry is None:
+                return None
+            stored_at, snapshot_key, version, results = entry
+            if time.monotonic() - stored_at > self._snapshot_ttl_seconds:
+                del self._snapshots[snapshot_id]
+                if self._snapshot_ids.get((snapshot_key, version)) == snapshot_id:
+                    del self._snapshot_ids[(snapshot_key, version)]
+                return None
+            if snapshot_key != key:
+                return None
+            self._snapshots.move_to_end(snapshot_id)
+            return results
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            # Snapshots stay live, but new rankings no longer share them
+            self._snapshot_ids.clear()
+
+    def _on_candidates_changed(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        self.clear()
+
+
+class MatchScoreEntry(NamedTuple):
+    """Memoized scores of one candidate against one set of job requirements.
+
+    ``match_result`` is the full calculate_overall_match result once a
+    breakdown has been built for the pair; ranking alone only stores scores.
+    """
+    match_score: float
+    skills_score: float
+    match_result: Optional[Dict[str, Any]] = None
+
+
+class MatchScoreMemo:
+    """LRU memo of candidate-job match scores, versioned by the candidate's updated_at.
+
+    Keys are (candidate id, candidate updated_at, requirements key) triples.
+    A candidate write moves updated_at, so its old entries are never looked
+    up again and age out of the LRU; no invalidation message is needed.
+    Hits, misses and evictions are counted for ``stats``.
+    """
+
+    def __init__(self, max_entries: int = 200000):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, MatchScoreEntry]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def init_app(self, app):
+        self._max_entries = app.config.get('SCORE_MEMO_MAX_ENTRIES', self._max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    @staticmethod
+    def requirements_key(job_requirements: Dict[str, Any]) -> str:
+        """Hash of the job requirement fields a match score depends on"""
+        scored = [job_requirements.get(name) for name in
+                  ('required_skills', 'preferred_skills', 'experience_level', 'location', 'is_remote')]
+        payload = json.dumps(scored, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def get_many(self, keys: List[Optional[tuple]]) -> List[Optional[MatchScoreEntry]]:
+        """Look up several keys under one lock; None keys are skipped and not counted"""
+        if not self.enabled:
+            return [None] * len(keys)
+        found: List[Optional[MatchScoreEntry]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key) if key is not None else None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                elif key is not None:
+                    self._misses += 1
+                found.append(entry)
+        return found
+
+    def get(self, key: tuple) -> Optional[MatchScoreEntry]:
+        return self.get_many([key])[0]
+
+    def put_many(self, items: List[tuple]):
+        """Store (key, MatchScoreEntry) pairs, evicting the least recently used beyond the bound"""
+        if not self.enabled or not items:
+            return
+        with self._lock:
+            for key, entry in items:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            overflow = len(self._entries) - self._max_entries
+            for _ in range(max(overflow, 0)):
+                self._entries.popitem(last=False)
+            self._evictions += max(overflow, 0)
+
+    def put(self, key: tuple, entry: MatchScoreEntry):
+        self.put_many([(key, entry)])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self._max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Ranked candidate search results shared by all pages of a search
+search_result_cache = SearchResultCache()
+
+# Per-(candidate, job requirements) scores shared by ranking and page breakdowns
+match_score_memo = MatchScoreMemo()
@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Profile of the search running in the current thread or task, if any
+_current_profile: ContextVar[Optional['SearchProfile']] = ContextVar('search_profile', default=None)
+
+
+class SearchProfile:
+    """Phase timings and counters collected while one search runs"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}  # phase name -> milliseconds
+        self.counters: Dict[str, Optional[int]] = {
+            'candidates_scanned': None,
+            'candidates_qualified': None,
+        }
+        self.db_round_trips = 0
+
+    def add_phase(self, name: str, milliseconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + milliseconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'phases': {name: round(milliseconds, 3) for name, milliseconds in self.phases.items()},
+            'candidates_scanned': self.counters['candidates_scanned'],
+            'candidates_qualified': self.counters['candidates_qualified'],
+            'db_round_trips': self.db_round_trips
+        }
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block as phase ``name`` of the current search; a no-op outside a profiled search"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, (time.perf_counter() - started_at) * 1000)
+
+
+def record(name: str, value: int):
+    """Set a counter of the current search, e.g. candidates_scanned"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.counters[name] = value
+
+
+def _count_round_trip(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.db_round_trips += 1
+
+
+class SearchMetrics:
+    """Collects per-phase search profiles and hands each finished one to the registered sinks.
+
+    Sinks are callables taking (profile dict, context dict); the context
+    holds the search time, scoring mode and whether the ranking cache hit.
+    The built-in sink logs searches slower than ``slow_search_ms`` with
+    their phase breakdown.
+    """
+
+    def __init__(self, slow_search_ms: float = 1000):
+        self._slow_search_ms = slow_search_ms
+        self._sinks: List[Callable[[Dict[str, Any], Dict[str, Any]], None]] = [self._log_slow_search]
+        self._registered = False
+
+    def init_app(self, app):
+        self._slow_search_ms = app.config.get('SLOW_SEARCH_MS', self._slow_search_ms)
+        if not self._registered:
+            # Listen on every engine; only queries run inside a profiled search are counted
+            event.listen(Engine, 'before_cursor_execute', _count_round_trip)
+            self._registered = True
+
+    def add_sink(self, sink: Callable[[Dict[str, Any], Dict[str, Any]], None]):
+        """Register a callback receiving every finished search profile"""
+        self._sinks.append(sink)
+        return sink
+
+    @contextmanager
+    def profile(self) -> Iterator[SearchProfile]:
+        """Collect the phases and round trips of the search run inside this block"""
+        profile = SearchProfile()
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+
+    def emit(self, profile: SearchProfile, context: Dict[str, Any]):
+        profile_dict = profile.to_dict()
+        for sink in self._sinks:
+            try:
+                sink(profile_dict, context)
+            except Exception as e:
+                logger.error(f"Error in search metrics sink: {str(e)}")
+
+    def _log_slow_search(self, profile: Dict[str, Any], context: Dict[str, Any]):
+        if context.get('search_time', 0) < self._slow_search_ms:
+            return
+        phases = ', '.join(f'{name}={milliseconds:.1f}ms' for name, milliseconds in profile['phases'].items())
+        logger.warning(
+            f"Slow candidate search: {context.get('search_time', 0):.1f}ms "
+            f"(mode={context.get('scoring_mode')}, cache_hit={context.get('cache_hit')}, "
+            f"scanned={profile['candidates_scanned']}, qualified={profile['candidates_qualified']}, "
+            f"db_round_trips={profile['db_round_trips']}) {phases}"
+        )
+
+
+# Search phase profiling and its metrics sinks
+search_metrics = SearchMetrics()
@@ -0,0 +1,164 @@
+from typing import Callable, Dict, List, Set, Tuple
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'skill_taxonomy.json')
+
+# Bound on memoized raw strings; the cache is cleared when it fills up
+MAX_MEMOIZED_SKILLS = 200000
+
+
+class SkillTaxonomy:
+    """Skill aliases and hierarchy compiled into O(1) lookup tables.
+
+    The taxonomy file maps each canonical skill to its aliases and parent
+    skills. Every alias (and the canonical name itself) resolves to its
+    canonical form; an alias claimed by several skills resolves to the first
+    one in the file. Unknown skills normalize to their lowercased, stripped
+    form.
+    """
+
+    def __init__(self, path: str = DEFAULT_TAXONOMY_PATH):
+        self._path = path
+        self._lock = threading.Lock()
+        self._aliases: Dict[str, str] = {}
+        self._parents: Dict[str, Tuple[str, ...]] = {}
+        # (alias table, memo) swapped together so a memo never mixes taxonomy versions
+        self._tables: Tuple[Dict[str, str], Dict[str, str]] = ({}, {})
+        self._loaded = False
+        self._reload_callbacks: List[Callable[[], None]] = []
+        self._rebuild_lock = threading.Lock()
+
+    def init_app(self, app):
+        self._path = app.config.get('SKILL_TAXONOMY_PATH', self._path)
+        self.load()
+
+    def on_reload(self, callback: Callable[[], None]):
+        """Register a callback fired after a runtime reload, e.g. to rebuild skill indexes"""
+        self._reload_callbacks.append(callback)
+        return callback
+
+    def load(self):
+        """Compile the taxonomy file into lookup tables"""
+        with open(self._path) as f:
+            data = json.load(f)
+
+        aliases: Dict[str, str] = {}
+        parents: Dict[str, Tuple[str, ...]] = {}
+        for name, entry in data.get('skills', {}).items():
+            canonical = name.lower().strip()
+            for alias in [canonical] + list(entry.get('aliases', [])):
+                aliases.setdefault(alias.lower().strip(), canonical)
+            parents[canonical] = tuple(parent.lower().strip() for parent in entry.get('parents', []))
+
+        # Swap tables in one step so concurrent lookups see either version
+        with self._lock:
+            self._aliases = aliases
+            self._parents = parents
+            self._tables = (aliases, {})
+            self._loaded = True
+
+        logger.info(f"Loaded skill taxonomy from {self._path}: {len(parents)} skills, {len(aliases)} aliases")
+
+    def reload(self):
+        """Reload the taxonomy file at runtime and notify dependents"""
+        self.load()
+        for callback in self._reload_callbacks:
+            callback()
+
+    def reload_in_background(self, app) -> bool:
+        """Reload the taxonomy file now and notify dependents on a background thread.
+
+        Dependents renormalize stored skills and rebuild indexes, which can
+        take minutes on a large pool, so they run inside an app context off
+        the calling request. Returns False without reloading while a previous
+        reload's dependents are still running.
+        """
+        if not self._rebuild_lock.acquire(blocking=False):
+            return False
+        try:
+            self.load()
+            threading.Thread(target=self._notify_reloaded, args=(app,), name='skill-taxonomy-reload', daemon=True).start()
+        except Exception:
+            self._rebuild_lock.release()
+            raise
+        return True
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._rebuild_lock.locked()
+
+    def _notify_reloaded(self, app):
+        from db import db
+
+        try:
+            with app.app_context():
+                for callback in self._reload_callbacks:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.error(f"Error in skill taxonomy reload callback {callback.__qualname__}: {str(e)}")
+                        db.session.rollback()
+                db.session.remove()
+            logger.info("Skill taxonomy reload finished")
+        finally:
+            self._rebuild_lock.release()
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def normalize(self, skill: str) -> str:
+        """Resolve a raw skill string to its canonical form"""
+        self._ensure_loaded()
+        aliases, memo = self._tables
+        normalized = memo.get(skill)
+        if normalized is not None:
+            return normalized
+
+        cleaned = skill.lower().strip()
+        normalized = aliases.get(cleaned, cleaned)
+
+        if len(memo) >= MAX_MEMOIZED_SKILLS:
+            memo.clear()
+        memo[skill] = normalized
+        return normalized
+
+    @property
+    def skill_count(self) -> int:
+        self._ensure_loaded()
+        return len(self._parents)
+
+    def aliases(self) -> Dict[str, str]:
+        """Alias -> canonical skill table"""
+        self._ensure_loaded()
+        return self._aliases
+
+    def parents(self, skill: str) -> Tuple[str, ...]:
+        """Direct parents of a skill in the hierarchy"""
+        self._ensure_loaded()
+        return self._parents.get(self.normalize(skill), ())
+
+    def ancestors(self, skill: str) -> List[str]:
+        """All ancestors of a skill, nearest first"""
+        self._ensure_loaded()
+        result: List[str] = []
+        seen: Set[str] = set()
+        pending = list(self._parents.get(self.normalize(skill), ()))
+        while pending:
+            parent = pending.pop(0)
+            if parent in seen:
+                continue
+            seen.add(parent)
+            result.append(parent)
+            pending.extend(self._parents.get(parent, ()))
+        return result
+
+
+# Shared taxonomy used by skill normalization
+skill_taxonomy = SkillTaxonomy()
@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional, Tuple
+from models import CandidateProfile
+from services.hiring import HiringMatchingService
+from services.search_cache import RankedResults
+from sqlalchemy import Float, Numeric, String, and_, any_, case, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+# Characters removed by str.strip() for ASCII input
+_WHITESPACE = ' \t\n\r\x0b\x0c'
+
+
+def _float(value):
+    """Bind a float as double precision so arithmetic matches Python floats"""
+    return cast(literal(value), Float)
+
+
+def _clean(expr):
+    """SQL equivalent of value.lower().strip()"""
+    return func.btrim(func.lower(expr), _WHITESPACE)
+
+
+def skills_score_expr(required_skills: List[str], preferred_skills: Optional[List[str]]):
+    """Skill score as computed by calculate_skill_match"""
+    if not required_skills:
+        return _float(0)
+
+    normalized_required = [HiringMatchingService.normalize_skill(skill) for skill in required_skills]
+    normalized_preferred = [HiringMatchingService.normalize_skill(skill) for skill in (preferred_skills or [])]
+
+    # Normalized on write, so the stored array is compared directly
+    candidate_normalized = CandidateProfile.normalized_skills
+
+    def matched_count(skills: List[str]):
+        # Duplicates in the job requirements count once per occurrence, as in Python
+        if not skills:
+            return literal(0)
+        job_skill = func.unnest(cast(literal(skills), ARRAY(String))).column_valued('job_skill')
+        return (
+            select(func.count())
+            .where(job_skill == any_(candidate_normalized))
+            .scalar_subquery()
+        )
+
+    required_rate = cast(matched_count(normalized_required), Float) / _float(len(normalized_required))
+    preferred_bonus = func.least(cast(matched_count(normalized_preferred), Float) * _float(0.05), _float(0.2))
+
+    return case(
+        (func.coalesce(func.cardinality(CandidateProfile.skills), 0) == 0, _float(0)),
+        else_=func.least((required_rate + preferred_bonus) * _float(100), _float(100))
+    )
+
+
+def experience_score_expr(required_level: str):
+    """Experience score as computed by calculate_experience_match"""
+    required_rank = HiringMatchingService.EXPERIENCE_LEVELS.get(required_level, 0)
+    if required_rank == 0:
+        return _float(0)
+
+    candidate_rank = case(HiringMatchingService.EXPERIENCE_LEVELS, value=CandidateProfile.experience_level, else_=0)
+    return cast(case(
+        (candidate_rank == 0, 0),
+        (candidate_rank == required_rank, 100),
+        (candidate_rank == required_rank + 1, 90),
+        (candidate_rank == required_rank + 2, 70),
+        (candidate_rank == required_rank - 1, 80),
+        (candidate_rank == required_rank - 2, 60),
+        else_=30
+    ), Float)
+
+
+def location_score_expr(job_location: Optional[str], is_remote: bool):
+    """Location score as computed by calculate_location_match"""
+    if is_remote:
+        return _float(100)
+
+    job_clean = (job_location or '').lower().strip()
+    job_parts = job_clean.split(',')
+
+    candidate_clean = _clean(CandidateProfile.location)
+    candidate_parts = func.string_to_array(candidate_clean, ',', type_=ARRAY(String))
+    part_count = func.coalesce(func.cardinality(candidate_parts), 0)
+
+    whens = [(candidate_clean == job_clean, 100)]
+    if len(job_parts) >= 2:
+        whens.append((and_(part_count >= 2,
+                           func.btrim(candidate_parts[1], _WHITESPACE) == job_parts[0].strip()), 90))
+        whens.append((and_(part_count >= 2,
+                           func.btrim(candidate_parts[part_count], _WHITESPACE) == job_parts[-1].strip()), 70))
+
+    return cast(case(*whens, else_=40), Float)
+
+
+def availability_score_expr():
+    """Availability score as computed by calculate_availability_match"""
+    return cast(case(HiringMatchingService.AVAILABILITY_SCORES, value=CandidateProfile.availability, else_=50), Float)
+
+
+def score_columns(job_requirements: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Build (skills score, unrounded overall score) expressions for a job"""
+    weights = HiringMatchingService.MATCH_WEIGHTS
+
+    skills_score = skills_score_expr(job_requirements.get('required_skills') or [],
+                                     job_requirements.get('preferred_skills'))
+    overall_score = (
+        skills_score * _float(weights['skills']) +
+        experience_score_expr(job_requirements.get('experience_level') or '') * _float(weights['experience']) +
+        location_score_expr(job_requirements.get('location'), job_requirements.get('is_remote', False)) * _float(weights['location']) +
+        availability_score_expr() * _float(weights['availability'])
+    )
+    return skills_score, overall_score
+
+
+def rank(query, job_requirements: Dict[str, Any], min_match_score: float,
+         skill_match_threshold: float, sort_config: Dict[str, Any],
+         top_k: Optional[int] = None, relevance=None) -> RankedResults:
+    """Filter and rank candidates inside PostgreSQL.
+
+    Returns the ids and match scores of the first ``top_k`` qualifying
+    candidates (all when None) and the total number of qualifying
+    candidates. Only ids and scores are fetched. ``relevance`` is the
+    keyword rank expression used by the relevance sort.
+    """
+    skills_score, overall_score = score_columns(job_requirements)
+    match_score = func.round(cast(overall_score, Numeric), 2)
+
+    scored = (
+        HiringMatchingService.apply_skill_prefilter(query, job_requirements, skill_match_threshold)
+        .filter(skills_score >= skill_match_threshold)
+        .filter(match_score >= min_match_score)
+    )
+
+    descending = sort_config.get('order', 'desc') == 'desc'
+    field = sort_config.get('field')
+    if field == 'match_score':
+        sort_column = match_score
+    elif field == 'name':
+        # Codepoint ordering, as Python sorts strings
+        sort_column = CandidateProfile.name.collate('C')
+    elif field == 'experience':
+        sort_column = case(HiringMatchingService.EXPERIENCE_LEVELS, value=CandidateProfile.experience_level, else_=0)
+    elif field == 'relevance':
+        sort_column = relevance
+    else:
+        sort_column = None
+
+    order_by = []
+    if sort_column is not None:
+        order_by.append(sort_column.desc() if descending else sort_column.asc())
+    order_by.append(CandidateProfile.id.asc())
+
+    ranked = (
+        scored
+        .with_entities(CandidateProfile.id, match_score.label('match_score'), func.count().over().label('total'))
+        .order_by(*order_by)
+    )
+    if top_k is not None:
+        ranked = ranked.limit(top_k)
+    rows = ranked.all()
+
+    total = rows[0].total if rows else 0
+    return RankedResults([row.id for row in rows], [float(row.match_score) for row in rows], total)
@@ -0,0 +1,249 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models import CandidateProfile, WorkExperience
+from db import db
+from services import model_events
+import numpy as np
+import logging
+import re
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Embedding width; 128 float32 values per candidate
+EMBEDDING_DIMENSIONS = 128
+
+# Bound on memoized feature vectors; the cache is cleared when it fills up
+MAX_MEMOIZED_FEATURES = 200000
+
+# Extra weight of an exact normalized skill over free-text words
+SKILL_FEATURE_WEIGHT = 2.0
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+_STOP_WORDS = frozenset("""
+a about an and are as at be been but by for from has have i in into is it its of on or our over so
+that the their this to was we were will with who you your years year work worked working team
+""".split())
+
+_CANDIDATE_COLUMNS = (
+    CandidateProfile.id,
+    CandidateProfile.bio,
+    CandidateProfile.normalized_skills,
+)
+
+_EXPERIENCE_COLUMNS = (
+    WorkExperience.candidate_id,
+    WorkExperience.title,
+    WorkExperience.role_description,
+    WorkExperience.normalized_skills,
+)
+
+
+def _words(text: Optional[str]) -> List[str]:
+    return [word for word in _WORD.findall((text or '').lower()) if word not in _STOP_WORDS]
+
+
+class CandidateEmbeddingIndex:
+    """Local text embeddings of candidates, kept as one float32 matrix.
+
+    A candidate's bio, skills and work experience become hashed features
+    (words, adjacent word pairs and normalized skills) with sublinear term
+    weights. Each feature maps to a fixed pseudo-random Gaussian vector
+    seeded by its CRC32, so the sum is a random projection of the
+    feature-hashing space. Rows are L2-normalized, which makes a dot product
+    the cosine similarity. Nothing leaves the process. Candidate writes
+    re-embed only the written rows, and deleted rows are tombstoned.
+    """
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self._dimensions = dimensions
+        self._lock = threading.RLock()
+        self._feature_vectors: Dict[str, np.ndarray] = {}
+        self._built = False
+        self._app = None
+        # Candidate writes committed while a build runs, applied once it finishes
+        self._pending_lock = threading.Lock()
+        self._building = False
+        self._pending_upserts: Set[str] = set()
+        self._pending_deletes: Set[str] = set()
+        self._reset()
+
+    def _reset(self):
+        self._size = 0
+        self._row_by_id: Dict[str, int] = {}
+        self._vectors = np.zeros((0, self._dimensions), dtype=np.float32)
+
+    def init_app(self, app):
+        """Keep embeddings current on candidate writes; they are built on first use, not at startup"""
+        self._app = app
+        model_events.track(CandidateProfile)
+        model_events.on_change(CandidateProfile, self._on_candidates_changed)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def build(self):
+        """(Re)embed every candidate"""
+        with self._lock:
+            with self._pending_lock:
+                self._building = True
+            try:
+                self._reset()
+                experience: Dict[str, List[Any]] = {}
+                for row in db.session.query(*_EXPERIENCE_COLUMNS).yield_per(5000):
+                    experience.setdefault(row.candidate_id, []).append(row)
+                for row in db.session.query(*_CANDIDATE_COLUMNS).yield_per(5000):
+                    self._upsert(row, experience.get(row.id, ()))
+            except Exception:
+                self._finish_build(built=False)
+                raise
+            upserted_ids, deleted_ids = self._finish_build(built=True)
+            # The rows read may predate writes committed during the build
+            self._apply_changes(upserted_ids, deleted_ids)
+        logger.info(f"Built candidate embeddings: {len(self._row_by_id)} candidates")
+
+    def rebuild(self):
+        """Rebuild if built or building; otherwise the first use builds from current data"""
+        if self._built or self._building:
+            self.build()
+
+    def _finish_build(self, built: bool) -> Tuple[Set[str], Set[str]]:
+        with self._pending_lock:
+            self._built = built
+            self._building = False
+            pending = self._pending_upserts, self._pending_deletes
+            self._pending_upserts, self._pending_deletes = set(), set()
+        return pending
+
+    def build_in_background(self) -> bool:
+        """Start embedding every candidate on a background thread unless built or building; True if started"""
+        with self._pending_lock:
+            if self._built or self._building or self._app is None:
+                return False
+            self._building = True
+        threading.Thread(target=self._build_in_app_context, name='candidate-embedding-build', daemon=True).start()
+        return True
+
+    def _build_in_app_context(self):
+        with self._app.app_context():
+            try:
+                self.build()
+            except Exception as e:
+                logger.error(f"Error building candidate embeddings: {str(e)}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def _feature_vector(self, feature: str) -> np.ndarray:
+        vector = self._feature_vectors.get(feature)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(feature.encode('utf-8')))
+            vector = rng.standard_normal(self._dimensions).astype(np.float32)
+            if len(self._feature_vectors) >= MAX_MEMOIZED_FEATURES:
+                self._feature_vectors.clear()
+            self._feature_vectors[feature] = vector
+        return vector
+
+    def embed(self, texts: Iterable[Optional[str]], skills: Iterable[str]) -> np.ndarray:
+        """L2-normalized embedding of free texts and normalized skills (zeros when empty)"""
+        counts: Dict[str, float] = {}
+        for text in texts:
+            words = _words(text)
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+            for first, second in zip(words, words[1:]):
+                pair = f'{first} {second}'
+                counts[pair] = counts.get(pair, 0) + 1
+        for skill in skills:
+            feature = f'skill:{skill}'
+            counts[feature] = counts.get(feature, 0) + SKILL_FEATURE_WEIGHT
+            for word in _words(skill):
+                counts[word] = counts.get(word, 0) + 1
+
+        vector = np.zeros(self._dimensions, dtype=np.float32)
+        for feature, count in counts.items():
+            vector += np.float32(1 + np.log(count)) * self._feature_vector(feature)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _grow(self, capacity: int):
+        if capacity <= len(self._vectors):
+            return
+        capacity = max(capacity, len(self._vectors) * 2, 1024)
+        grown = np.zeros((capacity, self._dimensions), dtype=np.float32)
+        grown[:len(self._vectors)] = self._vectors
+        self._vectors = grown
+
+    def _upsert(self, row, experience: Iterable[Any]):
+        texts = [row.bio]
+        skills = list(row.normalized_skills or ())
+        for item in experience:
+            texts.extend((item.title, item.role_description))
+            skills.extend(item.normalized_skills or ())
+
+        index = self._row_by_id.get(row.id)
+        if index is None:
+            index = self._size
+            self._grow(index + 1)
+            self._size += 1
+            self._row_by_id[row.id] = index
+        self._vectors[index] = self.embed(texts, skills)
+
+    def _remove(self, candidate_id: str):
+        index = self._row_by_id.pop(candidate_id, None)
+        if index is not None:
+            self._vectors[index] = 0
+
+    def _on_candidates_changed(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        with self._pending_lock:
+            if self._building:
+                self._pending_upserts |= upserted_ids
+                self._pending_deletes |= deleted_ids
+                return
+            if not self._built:
+                return
+        self._apply_changes(upserted_ids, deleted_ids)
+
+    def _apply_changes(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        with self._lock:
+            for candidate_id in deleted_ids:
+                self._remove(candidate_id)
+
+            if upserted_ids:
+                # Read committed rows on a separate connection; the committing session can't emit SQL here
+                experience: Dict[str, List[Any]] = {}
+                with db.engine.connect() as connection:
+                    for row in connection.execute(
+                        db.select(*_EXPERIENCE_COLUMNS).where(WorkExperience.candidate_id.in_(upserted_ids))
+                    ):
+                        experience.setdefault(row.candidate_id, []).append(row)
+                    rows = connection.execute(
+                        db.select(*_CANDIDATE_COLUMNS).where(CandidateProfile.id.in_(upserted_ids))
+                    ).all()
+
+                for row in rows:
+                    self._upsert(row, experience.get(row.id, ()))
+                for candidate_id in upserted_ids - {row.id for row in rows}:
+                    self._remove(candidate_id)
+
+    def similarities(self, query: np.ndarray, candidate_ids: Iterable[str]) -> Dict[str, float]:
+        """Cosine similarity of ``query`` to each known candidate in one matrix-vector product.
+
+        Empty until the embeddings are built; the first call starts building them in the background.
+        """
+        if not self._built:
+            self.build_in_background()
+            return {}
+        with self._lock:
+            known = [(candidate_id, self._row_by_id[candidate_id])
+                     for candidate_id in candidate_ids if candidate_id in self._row_by_id]
+            if not known:
+                return {}
+            scores = self._vectors[np.array([index for _, index in known], dtype=np.int64)] @ query
+        return {candidate_id: float(score) for (candidate_id, _), score in zip(known, scores)}
+
+
+# Candidate text embeddings behind the useAIRanking flag
+candidate_embedding_index = CandidateEmbeddingIndex()
@@ -0,0 +1,320 @@
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+from models import CandidateProfile
+from db import db
+from services import model_events
+import numpy as np
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_FEATURE_COLUMNS = (
+    CandidateProfile.id,
+    CandidateProfile.name,
+    CandidateProfile.skills,
+    CandidateProfile.experience_level,
+    CandidateProfile.availability,
+    CandidateProfile.location,
+)
+
+
+class CandidateScoringEngine:
+    """Candidate pool kept as columnar arrays and scored against a job in one vectorized pass.
+
+    Each candidate occupies a row. Skills are stored as posting sets of rows
+    per normalized skill (a sparse skill-presence matrix); experience rank,
+    availability score and location code are dense vectors. Deleted
+    candidates are tombstoned through the ``alive`` mask.
+    """
+
+    def __init__(self, normalize: Callable[[str], str], experience_levels: Dict[str, int],
+                 availability_scores: Dict[str, float], default_availability_score: float = 50):
+        self._normalize = normalize
+        self._experience_levels = experience_levels
+        self._availability_scores = availability_scores
+        self._default_availability_score = default_availability_score
+        self._lock = threading.RLock()
+        self._built = False
+        self._app = None
+        # Candidate writes committed while a build runs, applied once it finishes
+        self._pending_lock = threading.Lock()
+        self._building = False
+        self._pending_upserts: Set[str] = set()
+        self._pending_deletes: Set[str] = set()
+        self._reset()
+
+    def _reset(self):
+        self._size = 0
+        self._row_by_id: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._names: List[str] = []
+        self._row_skills: List[FrozenSet[str]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._has_skills = np.zeros(0, dtype=bool)
+        self._experience_rank = np.zeros(0, dtype=np.int8)
+        self._availability_score = np.zeros(0, dtype=np.float64)
+        self._location_code = np.zeros(0, dtype=np.int32)
+        self._locations: List[str] = []
+        self._location_codes: Dict[str, int] = {}
+        self._skill_rows: Dict[str, Set[int]] = {}
+        self._skill_arrays: Dict[str, np.ndarray] = {}
+
+    def init_app(self, app):
+        """Keep the pool current on candidate writes; it is loaded on first use, not at startup"""
+        self._app = app
+        model_events.track(CandidateProfile)
+        model_events.on_change(CandidateProfile, self._on_candidates_changed)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def build(self):
+        """(Re)load every candidate into the columnar pool"""
+        with self._lock:
+            with self._pending_lock:
+                self._building = True
+            try:
+                self._reset()
+                rows = db.session.query(*_FEATURE_COLUMNS).yield_per(5000)
+                for row in rows:
+                    self._upsert(row)
+            except Exception:
+                self._finish_build(built=False)
+                raise
+            upserted_ids, deleted_ids = self._finish_build(built=True)
+            # The rows read may predate writes committed during the build
+            self._apply_changes(upserted_ids, deleted_ids)
+        logger.info(f"Built candidate scoring engine: {len(self._row_by_id)} candidates")
+
+    def rebuild(self):
+        """Rebuild if built or building; otherwise the first use builds from current data"""
+        if self._built or self._building:
+            self.build()
+
+    def _finish_build(self, built: bool) -> Tuple[Set[str], Set[str]]:
+        with self._pending_lock:
+            self._built = built
+            self._building = False
+            pending = self._pending_upserts, self._pending_deletes
+            self._pending_upserts, self._pending_deletes = set(), set()
+        return pending
+
+    def build_in_background(self) -> bool:
+        """Start loading the pool on a background thread unless it is loaded or loading; True if started"""
+        with self._pending_lock:
+            if self._built or self._building or self._app is None:
+                return False
+            self._building = True
+        threading.Thread(target=self._build_in_app_context, name='candidate-scoring-build', daemon=True).start()
+        return True
+
+    def _build_in_app_context(self):
+        with self._app.app_context():
+            try:
+                self.build()
+            except Exception as e:
+                logger.error(f"Error building candidate scoring engine: {str(e)}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def ensure_built(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def _grow(self, capacity: int):
+        if capacity <= len(self._alive):
+            return
+        capacity = max(capacity, len(self._alive) * 2, 1024)
+
+        def resized(array):
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self._alive = resized(self._alive)
+        self._has_skills = resized(self._has_skills)
+        self._experience_rank = resized(self._experience_rank)
+        self._availability_score = resized(self._availability_score)
+        self._location_code = resized(self._location_code)
+
+    def _location_code_for(self, location: str) -> int:
+        code = self._location_codes.get(location)
+        if code is None:
+            code = len(self._locations)
+            self._location_codes[location] = code
+            self._locations.append(location)
+        return code
+
+    def _upsert(self, row):
+        candidate_id, name, skills, experience_level, availability, location = row
+        skills_set = frozenset(self._normalize(skill) for skill in (skills or []))
+
+        index = self._row_by_id.get(candidate_id)
+        if index is None:
+            index = self._size
+            self._grow(index + 1)
+            self._size += 1
+            self._row_by_id[candidate_id] = index
+            self._ids.append(candidate_id)
+            self._names.append(name)
+            self._row_skills.append(frozenset())
+        else:
+            self._names[index] = name
+
+        self._set_skills(index, skills_set)
+        self._alive[index] = True
+        self._has_skills[index] = bool(skills)
+        self._experience_rank[index] = self._experience_levels.get(experience_level, 0)
+        self._availability_score[index] = self._availability_scores.get(availability, self._default_availability_score)
+        self._location_code[index] = self._location_code_for(location or '')
+
+    def _set_skills(self, index: int, skills: FrozenSet[str]):
+        old_skills = self._row_skills[index]
+        for skill in old_skills - skills:
+            self._skill_rows[skill].discard(index)
+            self._skill_arrays.pop(skill, None)
+        for skill in skills - old_skills:
+            self._skill_rows.setdefault(skill, set()).add(index)
+            self._skill_arrays.pop(skill, None)
+        self._row_skills[index] = skills
+
+    def _remove(self, candidate_id: str):
+        index = self._row_by_id.pop(candidate_id, None)
+        if index is None:
+            return
+        self._set_skills(index, frozenset())
+        self._alive[index] = False
+        self._ids[index] = None
+
+    def _on_candidates_changed(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        with self._pending_lock:
+            if self._building:
+                self._pending_upserts |= upserted_ids
+                self._pending_deletes |= deleted_ids
+                return
+            if not self._built:
+                return
+        self._apply_changes(upserted_ids, deleted_ids)
+
+    def _apply_changes(self, upserted_ids: Set[str], deleted_ids: Set[str]):
+        with self._lock:
+            for candidate_id in deleted_ids:
+                self._remove(candidate_id)
+
+            if upserted_ids:
+                # Read committed rows on a separate connection; the committing session can't emit SQL here
+                found = set()
+                with db.engine.connect() as connection:
+                    rows = connection.execute(
+                        db.select(*_FEATURE_COLUMNS).where(CandidateProfile.id.in_(upserted_ids))
+                    )
+                    for row in rows:
+                        self._upsert(row)
+                        found.add(row[0])
+
+                for candidate_id in upserted_ids - found:
+                    self._remove(candidate_id)
+
+    def _skill_postings(self, skill: str) -> np.ndarray:
+        postings = self._skill_arrays.get(skill)
+        if postings is None:
+            postings = np.fromiter(self._skill_rows.get(skill, ()), dtype=np.int64)
+            self._skill_arrays[skill] = postings
+        return postings
+
+    def _count_matches(self, skills: List[str]) -> np.ndarray:
+        # Duplicates in the job requirements count once per occurrence, as in Python
+        counts = np.zeros(self._size, dtype=np.int64)
+        for skill in skills:
+            counts[self._skill_postings(skill)] += 1
+        return counts
+
+    def rank(self, job_requirements: Dict[str, Any], min_match_score: float, skill_match_threshold: float,
+             sort_config: Dict[str, Any], score_location: Callable[[str], float],
+             score_experience: Callable[[int], float], weights: Dict[str, float],
+             allowed_ids: Optional[Set[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """Score the whole pool and return qualifying candidate ids in sort order with their match scores.
+
+        ``score_location`` maps a raw candidate location to its location score
+        and ``score_experience`` maps a candidate experience rank to its
+        experience score, both for this job; they are evaluated once per
+        distinct value rather than once per candidate.
+        """
+        self.ensure_built()
+
+        with self._lock:
+            size = self._size
+            required = [self._normalize(skill) for skill in (job_requirements.get('required_skills') or [])]
+            preferred = [self._normalize(skill) for skill in (job_requirements.get('preferred_skills') or [])]
+
+            # Skills component
+            if required:
+                required_rate = self._count_matches(required) / len(required)
+                preferred_bonus = np.minimum(self._count_matches(preferred) * 0.05, 0.2)
+                skills_score = np.minimum((required_rate + preferred_bonus) * 100, 100)
+                skills_score = np.where(self._has_skills[:size], skills_score, 0.0)
+            else:
+                skills_score = np.zeros(size, dtype=np.float64)
+
+            # Experience and location components, evaluated per distinct value
+            experience_table = np.array([score_experience(rank) for rank in range(max(self._experience_levels.values()) + 1)],
+                                        dtype=np.float64)
+            experience_score = experience_table[self._experience_rank[:size]]
+            location_table = np.array([score_location(location) for location in self._locations], dtype=np.float64)
+            location_score = location_table[self._location_code[:size]] if len(location_table) else np.zeros(size)
+
+            overall = (
+                skills_score * weights['skills'] +
+                experience_score * weights['experience'] +
+                location_score * weights['location'] +
+                self._availability_score[:size] * weights['availability']
+            )
+            match_score = _round_scores(overall)
+
+            # Thresholds and filters
+            qualified = self._alive[:size] & (match_score >= min_match_score) & (skills_score >= skill_match_threshold)
+            if allowed_ids is not None:
+                allowed = np.zeros(size, dtype=bool)
+                allowed_rows = [self._row_by_id[i] for i in allowed_ids if i in self._row_by_id]
+                allowed[np.array(allowed_rows, dtype=np.int64)] = True
+                qualified &= allowed
+
+            rows = np.flatnonzero(qualified)
+
+            # Sort, keeping pool order for ties as a stable sort does
+            descending = sort_config.get('order', 'desc') == 'desc'
+            field = sort_config.get('field')
+            if field == 'match_score':
+                keys = match_score[rows]
+            elif field == 'experience':
+                keys = self._experience_rank[rows].astype(np.int64)
+            elif field == 'name':
+                keys = np.array([self._names[row] for row in rows], dtype=object)
+            else:
+                keys = None
+
+            if keys is not None and len(rows):
+                if descending:
+                    # Reverse, stable sort, then reverse back so ties keep pool order
+                    order = np.argsort(keys[::-1], kind='stable')[::-1]
+                    order = len(rows) - 1 - order
+                else:
+                    order = np.argsort(keys, kind='stable')
+                rows = rows[order]
+
+            return [self._ids[row] for row in rows], match_score[rows]
+
+
+def _round_scores(scores: np.ndarray) -> np.ndarray:
+    """Round to two decimals exactly as Python's round() does"""
+    rounded = np.round(scores, 2)
+    # np.round scales by 100 first, which can land on the other side of a half-cent tie
+    scaled = scores * 100
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for row in ties:
+        rounded[row] = round(float(scores[row]), 2)
+    return rounded
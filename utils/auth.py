@@ -1,8 +1,9 @@
 import os
+import hmac
 import jwt
 import requests
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from jwt import PyJWKClient
 
 CLERK_JWT_ISSUER = 'https://exact-horse-66.clerk.accounts.dev'
@@ -36,6 +37,19 @@ def require_auth(f):
         return f(*args, **kwargs)
     return decorated
 
+def require_ops_token(f):
+    """Restrict a route to operators holding the OPS_API_TOKEN shared secret"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        expected = current_app.config.get('OPS_API_TOKEN')
+        if not expected:
+            return jsonify({'error': 'Ops endpoints are disabled'}), 403
+        token = request.headers.get('X-Ops-Token', '')
+        if not hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8')):
+            return jsonify({'error': 'Missing or invalid X-Ops-Token header'}), 401
+        return f(*args, **kwargs)
+    return decorated
+
 def get_current_user():
     """Get the current authenticated user from the database"""
     from models import User